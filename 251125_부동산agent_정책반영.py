@@ -207,6 +207,34 @@ def create_policy_index_if_needed():
     print(f"[INFO] created index '{ES_POLICY_INDEX}' (dims={dims})")
 
 
+# 파일마다 새로 만들지 않도록 splitter는 모듈 전역으로 둠
+POLICY_CHUNK_SIZE = 1000
+POLICY_SPLITTER = RecursiveCharacterTextSplitter(
+    chunk_size=POLICY_CHUNK_SIZE,
+    chunk_overlap=150,
+    separators=["\n\n", "\n", " ", ""],
+)
+
+
+def load_and_split_policy_pdf(path: str) -> List[str]:
+    """
+    PDF 하나를 페이지 단위로 읽고 텍스트 청크 리스트로 분할.
+    """
+    reader = PdfReader(path)
+    pages = [page.extract_text() or "" for page in reader.pages]
+    contents = []
+    for text in pages:
+        text = text.strip()
+        if not text:
+            continue
+        # 청크 크기 이하인 페이지는 분할 결과가 자기 자신뿐이므로 splitter를 거치지 않음
+        if len(text) <= POLICY_CHUNK_SIZE:
+            contents.append(text)
+            continue
+        contents.extend(POLICY_SPLITTER.split_text(text))
+    return contents
+
+
 def index_policy_pdfs(pdf_paths: List[str]):
     """
     최근 3개 정책 PDF를:
@@ -217,40 +245,17 @@ def index_policy_pdfs(pdf_paths: List[str]):
     """
     create_policy_index_if_needed()
 
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=150,
-        separators=["\n\n", "\n", " ", ""],
-    )
-
     from tqdm import tqdm
 
     for path in pdf_paths:
         print(f"[INFO] indexing policy pdf: {path}")
-        reader = PdfReader(path)
-        pages = [page.extract_text() or "" for page in reader.pages]
-
-        docs = []
-        for i, text in enumerate(pages):
-            docs.append(
-                {
-                    "page_content": text,
-                    "metadata": {
-                        "source_file": path,
-                        "page": i,
-                    },
-                }
-            )
 
-        # 2) 청크 분할
-        texts = [d["page_content"] for d in docs]
-        # 간단하게 splitter를 직접 적용
-        chunks = splitter.create_documents(texts)
+        # 1~2) 로드 + 청크 분할
+        contents = load_and_split_policy_pdf(path)
 
         pub_date = parse_date_from_filename(path)
 
         # 3) OpenAI 임베딩 계산 (청크 단위)
-        contents = [c.page_content for c in chunks]
         vectors = embedding_model.embed_documents(contents)
 
         # 4) ES 인덱싱
@@ -5,10 +5,20 @@
 # 2단계: 분석 결과를 바탕으로 ES 하이브리드 검색 + 구글 검색을 수행하는 Agent
 # 3단계: 수집한 정보를 기반으로 최종 의사결정 리포트를 생성하는 체인
 
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
 from typing import List, Dict, Any
 
+import httpx
+
 from langchain_openai import ChatOpenAI
-from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
 from langchain.tools import tool
 from langchain.agents import (
@@ -16,26 +26,90 @@ from langchain.agents import (
     create_tool_calling_agent,
 )
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.output_parsers import StrOutputParser
+
+logger = logging.getLogger(__name__)
 
 
 # =========================
 # 0. 공통 LLM 설정
 # =========================
+# 프롬프트 캐싱: OpenAI는 1024토큰 이상의 동일한 prefix를 자동으로 캐시하므로
+# 모든 템플릿은 고정 지시문을 앞에, 호출마다 바뀌는 변수를 맨 뒤에 둔다.
+class PromptCacheLogger(BaseCallbackHandler):
+    """LLM 호출마다 prompt 토큰 중 캐시 적중 토큰 수를 로깅"""
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        # 스트리밍(astream) 호출은 llm_output이 비어 있으므로 메시지의 usage_metadata를 우선 사용
+        try:
+            usage_metadata = getattr(response.generations[0][0].message, "usage_metadata", None)
+        except (IndexError, AttributeError):
+            usage_metadata = None
+        if usage_metadata:
+            prompt_tokens = usage_metadata.get("input_tokens")
+            cached_tokens = (usage_metadata.get("input_token_details") or {}).get("cache_read", 0)
+        else:
+            usage = (response.llm_output or {}).get("token_usage") or {}
+            prompt_tokens = usage.get("prompt_tokens")
+            cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+        logger.info("prompt_tokens=%s cached_tokens=%s", prompt_tokens, cached_tokens)
+
+
+_shared_llm = None
+
+
+def _make_async_http_client() -> httpx.AsyncClient:
+    """
+    모든 체인이 공유할 커넥션 풀.
+    h2 패키지가 설치되어 있으면 HTTP/2 멀티플렉싱을 사용한다.
+    """
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=64),
+    )
+
+
 def get_llm() -> ChatOpenAI:
     """
     공통으로 사용할 LLM 설정.
     필요에 따라 모델명, temperature, API Key(.env) 등을 수정.
+    의도 분석 / Agent / 리포트 체인이 하나의 인스턴스(와 HTTP 커넥션 풀)를 공유한다.
     """
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",  # 또는 gpt-4o 등
-        temperature=0.2,
-    )
-    return llm
+    global _shared_llm
+    if _shared_llm is None:
+        _shared_llm = ChatOpenAI(
+            model="gpt-4o-mini",  # 또는 gpt-4o 등
+            temperature=0.2,
+            http_async_client=_make_async_http_client(),
+            stream_usage=True,  # 스트리밍 응답에도 토큰 사용량(캐시 적중 포함)을 받음
+            callbacks=[PromptCacheLogger()],
+        )
+    return _shared_llm
 
 
 llm = get_llm()
 
 
+# 공유 httpx.AsyncClient의 keep-alive 커넥션은 처음 사용한 이벤트 루프에 묶이므로,
+# 동기 래퍼들은 호출마다 asyncio.run으로 새 루프를 만들지 않고 하나의 루프를 재사용한다.
+_sync_loop = None
+
+
+def _run_sync(coro):
+    """동기 코드에서 코루틴을 모듈 공용 이벤트 루프로 실행"""
+    global _sync_loop
+    if _sync_loop is None or _sync_loop.is_closed():
+        _sync_loop = asyncio.new_event_loop()
+    return _sync_loop.run_until_complete(coro)
+
+
 # =========================
 # 1. 의도 분석 체인
 # =========================
@@ -43,40 +117,48 @@ llm = get_llm()
 
 INTENT_TEMPLATE = """
 당신은 부동산 의사결정 지원 시스템의 '질문 분석기'입니다.
-사용자의 발화를 읽고, 집 추천 / 대출 정책 / 동네 비교 등에 필요한 정보를
-구조화된 JSON 형식으로 추출하세요.
+사용자의 발화를 읽고, 집 추천 / 대출 정책 / 동네 비교 등에 필요한 정보를 추출하세요.
+값이 불명확하면 '모름'으로 채우세요.
 
 [사용자 질문]
 {question}
-
-[출력 형식(JSON)]
-{{
-  "question_type": "집추천 | 대출정책질문 | 동네비교 | 기타",
-  "budget": "숫자만 또는 '모름' (예: '700000000', '모름')",
-  "deal_type": "매매 | 전세 | 월세 | 모름",
-  "preferred_areas": "콤마로 구분된 구/동 이름들 (예: '강동구, 마포구')",
-  "commute_place": "주요 출근지 (예: '강남역', '여의도역') 또는 '모름'",
-  "household": "1인/2인/3인 이상 등 가구 형태 또는 '모름'",
-  "lifestyle": "학군, 육아, 조용한 동네, 문화생활, 자연환경 등 핵심 키워드 요약",
-  "risk_preference": "안정형 | 중립 | 공격형 | 모름",
-  "extra_constraints": "입주 시점, 대출 여부, 투자/실거주 등 추가 제약사항 요약"
-}}
-
-주의:
-- 반드시 위 JSON 형식을 그대로 사용하고, 한국어 설명 문장은 쓰지 마세요.
-- 값이 불명확하면 '모름'으로 채우세요.
 """
 
+# 출력 형식은 프롬프트 대신 JSON Schema(structured outputs)로 강제한다.
+_UNKNOWN_OK = "불명확하면 '모름'"
+INTENT_SCHEMA = {
+    "name": "intent",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "question_type": {"type": "string", "enum": ["집추천", "대출정책질문", "동네비교", "기타"]},
+            "budget": {"type": "string", "description": f"숫자만 (예: '700000000'), {_UNKNOWN_OK}"},
+            "deal_type": {"type": "string", "enum": ["매매", "전세", "월세", "모름"]},
+            "preferred_areas": {"type": "string", "description": "콤마로 구분된 구/동 이름들 (예: '강동구, 마포구')"},
+            "commute_place": {"type": "string", "description": f"주요 출근지 (예: '강남역'), {_UNKNOWN_OK}"},
+            "household": {"type": "string", "description": f"1인/2인/3인 이상 등 가구 형태, {_UNKNOWN_OK}"},
+            "lifestyle": {"type": "string", "description": "학군, 육아, 조용한 동네, 문화생활, 자연환경 등 핵심 키워드 요약"},
+            "risk_preference": {"type": "string", "enum": ["안정형", "중립", "공격형", "모름"]},
+            "extra_constraints": {"type": "string", "description": "입주 시점, 대출 여부, 투자/실거주 등 추가 제약사항 요약"},
+        },
+        "required": [
+            "question_type", "budget", "deal_type", "preferred_areas", "commute_place",
+            "household", "lifestyle", "risk_preference", "extra_constraints",
+        ],
+        "additionalProperties": False,
+    },
+}
+
 intent_prompt = PromptTemplate(
     template=INTENT_TEMPLATE,
     input_variables=["question"],
 )
 
-intent_chain = LLMChain(
-    llm=llm,
-    prompt=intent_prompt,
-    output_key="intent_json",
-)
+# 공유 LLM(커넥션 풀 포함)에 response_format만 바인딩
+intent_llm = llm.bind(response_format={"type": "json_schema", "json_schema": INTENT_SCHEMA})
+
+intent_chain = intent_prompt | intent_llm | StrOutputParser()
 
 
 # =========================
@@ -84,17 +166,44 @@ intent_chain = LLMChain(
 # =========================
 
 
-@tool
-def es_hybrid_search(query: str) -> str:
-    """
-    ElasticSearch 하이브리드 검색(실거래가, 호가, 리뷰, 정책 문서 등)에 사용되는 도구.
+# 도구 결과 디스크 캐시: sha256("도구명|쿼리") 키로 .rag_cache/ 아래 JSON 파일에 저장
+# (실행 위치와 무관하게 이 파일 옆에 두며, RAG_CACHE_DIR 환경변수로 변경 가능)
+RAG_CACHE_DIR = Path(os.getenv("RAG_CACHE_DIR") or Path(__file__).resolve().parent / ".rag_cache")
+RAG_CACHE_TTL = 24 * 3600
 
-    Args:
-        query: '지역, 예산, 평형, 라이프스타일' 등이 반영된 검색 질의 문자열
 
-    Returns:
-        검색 결과를 요약한 문자열 (실제 구현에서는 상위 N개 매물/단지/문서 요약)
-    """
+def disk_cached(tool_name: str):
+    """동일한 쿼리의 도구 호출 결과를 TTL 동안 디스크에서 재사용하는 async 데코레이터"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(query: str) -> str:
+            key = hashlib.sha256(f"{tool_name}|{query}".encode("utf-8")).hexdigest()
+            path = RAG_CACHE_DIR / f"{key}.json"
+            try:
+                entry = json.loads(path.read_text(encoding="utf-8"))
+                if time.time() - entry["ts"] < RAG_CACHE_TTL:
+                    return entry["result"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+            result = await func(query)
+            try:
+                RAG_CACHE_DIR.mkdir(exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_text(json.dumps({"ts": time.time(), "result": result}, ensure_ascii=False), encoding="utf-8")
+                tmp.replace(path)
+            except OSError as e:
+                logger.warning("tool cache write failed: %s", e)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+@disk_cached("es_hybrid_search")
+async def _es_hybrid_search(query: str) -> str:
     # TODO:
     #  - 실제 환경에서는 requests 또는 Elasticsearch Python client를 사용하여
     #    ES 인덱스(실거래가, 호가, 정책문서, 리뷰 등)에 하이브리드 검색 수행
@@ -109,17 +218,8 @@ def es_hybrid_search(query: str) -> str:
     )
 
 
-@tool
-def google_policy_search(query: str) -> str:
-    """
-    구글(또는 SerpAPI, DuckDuckGo)을 이용해 최신 대출/주택 정책, 뉴스 등을 검색하는 도구.
-
-    Args:
-        query: 정책/규제/금리/뉴스 위주의 검색 질의
-
-    Returns:
-        정책/뉴스 요약 문자열
-    """
+@disk_cached("google_policy_search")
+async def _google_policy_search(query: str) -> str:
     # TODO:
     #  - 실제 환경에서는 serpapi/duckduckgo-search/wikipedia 등 LangChain 래퍼 활용
     #  - 예: DuckDuckGoSearchAPIWrapper().run(query)
@@ -132,6 +232,34 @@ def google_policy_search(query: str) -> str:
     )
 
 
+@tool
+async def es_hybrid_search(query: str) -> str:
+    """
+    ElasticSearch 하이브리드 검색(실거래가, 호가, 리뷰, 정책 문서 등)에 사용되는 도구.
+
+    Args:
+        query: '지역, 예산, 평형, 라이프스타일' 등이 반영된 검색 질의 문자열
+
+    Returns:
+        검색 결과를 요약한 문자열 (실제 구현에서는 상위 N개 매물/단지/문서 요약)
+    """
+    return await _es_hybrid_search(query)
+
+
+@tool
+async def google_policy_search(query: str) -> str:
+    """
+    구글(또는 SerpAPI, DuckDuckGo)을 이용해 최신 대출/주택 정책, 뉴스 등을 검색하는 도구.
+
+    Args:
+        query: 정책/규제/금리/뉴스 위주의 검색 질의
+
+    Returns:
+        정책/뉴스 요약 문자열
+    """
+    return await _google_policy_search(query)
+
+
 tools = [es_hybrid_search, google_policy_search]
 
 
@@ -177,8 +305,7 @@ rag_prompt = ChatPromptTemplate.from_messages(
     ]
 )
 
-rag_llm = get_llm()
-rag_agent_core = create_tool_calling_agent(rag_llm, tools, rag_prompt)
+rag_agent_core = create_tool_calling_agent(llm, tools, rag_prompt)
 
 rag_executor = AgentExecutor(
     agent=rag_agent_core,
@@ -195,7 +322,16 @@ def run_rag_agent(question: str, intent_json: str) -> Dict[str, Any]:
     AgentExecutor를 한 번 감싼 helper 함수.
     - 반환값: {"output": "...", "intermediate_steps": [...]} 형태의 딕셔너리
     """
-    result = rag_executor.invoke({"question": question, "intent_json": intent_json})
+    return _run_sync(run_rag_agent_async(question, intent_json))
+
+
+async def run_rag_agent_async(question: str, intent_json: str) -> Dict[str, Any]:
+    """
+    run_rag_agent의 비동기 버전.
+    - 모델이 한 턴에 여러 tool_calls(parallel tool calling)를 내면
+      AgentExecutor가 비동기 도구들을 동시에 실행한다.
+    """
+    result = await rag_executor.ainvoke({"question": question, "intent_json": intent_json})
     return result
 
 
@@ -206,16 +342,7 @@ def run_rag_agent(question: str, intent_json: str) -> Dict[str, Any]:
 
 REPORT_TEMPLATE = """
 당신은 '부동산 의사결정 리포트 생성기'입니다.
-다음 정보를 바탕으로 사용자의 의사결정에 바로 활용 가능한 리포트를 작성하세요.
-
-[1] 원본 질문
-{question}
-
-[2] 질문 분석(JSON)
-{intent_json}
-
-[3] 검색/분석 메모
-{research_notes}
+아래 [1]~[3] 정보를 바탕으로 사용자의 의사결정에 바로 활용 가능한 리포트를 작성하세요.
 
 [리포트 작성 지침]
 - 전체를 한국어로 작성합니다.
@@ -235,6 +362,15 @@ REPORT_TEMPLATE = """
      - '이 사용자의 상황이라면 ○○을 우선 추천'처럼 명시적 결론 제시
 
 리포트의 각 섹션에는 번호와 소제목을 붙여 주세요.
+
+[1] 원본 질문
+{question}
+
+[2] 질문 분석(JSON)
+{intent_json}
+
+[3] 검색/분석 메모
+{research_notes}
 """
 
 report_prompt = PromptTemplate(
@@ -242,37 +378,51 @@ report_prompt = PromptTemplate(
     input_variables=["question", "intent_json", "research_notes"],
 )
 
-report_chain = LLMChain(
-    llm=llm,
-    prompt=report_prompt,
-    output_key="report",
-)
+# LCEL 체인: 토큰 단위 스트리밍(astream)을 위해 문자열 파서로 끝냄
+report_chain = report_prompt | llm | StrOutputParser()
 
 
 # =========================
 # 5. 전체 Agentic RAG 파이프라인 함수
 # =========================
-def run_agentic_rag_pipeline(question: str) -> str:
+async def run_agentic_rag_pipeline_async(question: str, stream: bool = True) -> str:
     """
     프로젝트 기획서의 Agentic RAG 3단계
       1) 의도 분석 → 2) 도구 사용(ES + Google) → 3) 리포트 생성
-    을 한 번에 실행하는 편의 함수.
+    을 비동기로 실행하는 함수. 2단계의 도구 호출은 한 턴 안에서 병렬로 수행된다.
+    stream=True이면 3단계 리포트를 토큰이 도착하는 대로 stdout에 출력한다.
     """
     # 1) 의도 분석
-    intent_json: str = intent_chain.run(question=question)
+    intent_json: str = await intent_chain.ainvoke({"question": question})
 
     # 2) Agentic RAG (도구 호출 단계)
-    rag_result = run_rag_agent(question, intent_json)
+    rag_result = await run_rag_agent_async(question, intent_json)
     research_notes: str = rag_result["output"]
 
-    # 3) 최종 리포트 생성
-    report: str = report_chain.run(
-        question=question,
-        intent_json=intent_json,
-        research_notes=research_notes,
-    )
-
-    return report
+    # 3) 최종 리포트 생성 (생성되는 대로 stdout에 출력하고, 전체 문자열을 반환)
+    chunks: List[str] = []
+    async for chunk in report_chain.astream(
+        {
+            "question": question,
+            "intent_json": intent_json,
+            "research_notes": research_notes,
+        }
+    ):
+        if stream:
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+        chunks.append(chunk)
+    if stream:
+        sys.stdout.write("\n")
+    return "".join(chunks)
+
+
+def run_agentic_rag_pipeline(question: str, stream: bool = True) -> str:
+    """
+    run_agentic_rag_pipeline_async를 동기 코드에서 호출하기 위한 래퍼.
+    (이미 이벤트 루프가 돌고 있는 환경에서는 async 버전을 직접 await 할 것)
+    """
+    return _run_sync(run_agentic_rag_pipeline_async(question, stream=stream))
 
 
 # =========================
@@ -285,5 +435,5 @@ if __name__ == "__main__":
         "강동구랑 마포구 중에 어디가 더 나을까요? 대출 규제도 같이 봐줘."
     )
 
+    # 리포트는 생성되는 대로 stdout에 스트리밍된다.
     final_report = run_agentic_rag_pipeline(sample_question)
-    print(final_report)
@@ -1,8 +1,9 @@
 import time
 import pandas as pd
-import math
 import argparse
 import json
+import csv
+import atexit
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -10,12 +11,31 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import StaleElementReferenceException, ElementClickInterceptedException
+from selenium.common.exceptions import StaleElementReferenceException, ElementClickInterceptedException, TimeoutException
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
+try:
+    from tqdm import tqdm
+except ImportError:  # 진행률 표시는 선택 사항
+    def tqdm(iterable, **kwargs):
+        return iterable
+try:
+    from playwright.async_api import async_playwright
+except ImportError:  # playwright 엔진은 선택 사항
+    async_playwright = None
 import tempfile
+import uuid
 import random
+import asyncio
+import multiprocessing as mp
+from multiprocessing import util as mp_util
 import socket
+import subprocess
+from urllib.parse import quote, urlparse
+try:
+    import httpx
+except ImportError:  # api 엔진은 선택 사항
+    httpx = None
 # shutil back for profile directory copying
 import os
 import shutil
@@ -23,7 +43,17 @@ import shutil
 
 # 1. 데이터 로드 (테스트용 데이터 프레임 생성)
 # 실제 사용 시에는 pd.read_csv 사용
-df = pd.read_csv('아파트_수집_최종.csv')
+# 크롤링에 쓰는 컬럼만 읽고, pyarrow가 있으면 멀티스레드 파서 사용
+APT_CSV_COLUMNS = ['kaptCode', 'kaptName', 'doroJuso']
+try:
+    df = pd.read_csv('아파트_수집_최종.csv', engine='pyarrow', usecols=APT_CSV_COLUMNS)
+except ImportError:
+    df = pd.read_csv('아파트_수집_최종.csv', usecols=APT_CSV_COLUMNS)
+# 도로명 주소 유효 여부를 한 번에 계산 (행마다 NaN/공백 검사를 반복하지 않음)
+df['_juso_valid'] = df['doroJuso'].notna() & (df['doroJuso'].astype(str).str.strip() != '')
+# 아파트 이름이 비어 있으면 검색 자체가 무의미하므로 미리 표시해 두고 건너뜀
+# (source_index가 원본 행 번호이므로 df를 필터링하지 않고 플래그만 둠)
+df['_name_valid'] = df['kaptName'].notna() & (df['kaptName'].astype(str).str.strip() != '')
 # data = {
 #     'kaptCode': ['A10023990'],
 #     'kaptName': ['청년주택 와이엔타워'],
@@ -56,20 +86,91 @@ chrome_options.add_experimental_option("useAutomationExtension", False)
 # User-Agent 변경
 chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
 
+# 크롤링에 불필요한 리소스 (이미지, 폰트, 트래커)
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif", "*.svg", "*.woff*", "*.ttf", "*.mp4",
+    "*google-analytics*", "*googletagmanager*", "*hotjar*",
+]
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# 해석된 chromedriver 경로 캐시 (webdriver_manager의 버전 확인/HTTP 요청을 프로세스당 1회로)
+os.environ.setdefault('WDM_LOCAL', '1')
+os.environ.setdefault('WDM_LOG', '0')
+_DRIVER_PATH = None
+
+
+def get_driver_path():
+    global _DRIVER_PATH
+    if _DRIVER_PATH is None:
+        _DRIVER_PATH = ChromeDriverManager().install()
+    return _DRIVER_PATH
+
+
+def find_chrome_binary():
+    """CHROME_BINARY 환경변수 또는 PATH에서 Chrome/Chromium 실행 파일을 찾음"""
+    candidates = [os.getenv('CHROME_BINARY'), 'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+    for c in candidates:
+        if c and (os.path.isfile(c) or shutil.which(c)):
+            return c if os.path.isfile(c) else shutil.which(c)
+    win_path = os.path.join(os.environ.get('PROGRAMFILES', r'C:\Program Files'), 'Google', 'Chrome', 'Application', 'chrome.exe')
+    if os.path.isfile(win_path):
+        return win_path
+    raise FileNotFoundError("Chrome 실행 파일을 찾을 수 없습니다. CHROME_BINARY 환경변수를 설정하세요.")
+
+
+def launch_shared_chrome(port, profile_dir, headless=False):
+    """워커들이 CDP로 붙을 Chrome 1개를 띄우고 디버깅 포트가 열릴 때까지 대기"""
+    cmd = [
+        find_chrome_binary(),
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={os.path.abspath(profile_dir)}",
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+        "--disable-gpu",
+        "--window-size=1920,1080",
+        "--lang=ko-KR",
+        "--blink-settings=imagesEnabled=false",
+        "--disable-blink-features=AutomationControlled",
+    ]
+    if headless:
+        cmd.append("--headless=new")
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                print(f"✅ 공유 Chrome 실행 (port {port}, pid {proc.pid})")
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"공유 Chrome 디버깅 포트 {port}가 열리지 않았습니다.")
+
+
+def attach_driver(attach_port):
+    """이미 실행 중인 Chrome(CDP 포트)에 붙어서, 이 워커 전용 새 탭으로 전환한 드라이버를 반환"""
+    options = Options()
+    options.add_experimental_option("debuggerAddress", f"127.0.0.1:{attach_port}")
+    drv = webdriver.Chrome(service=Service(get_driver_path()), options=options)
+    # 워커마다 별도 탭(target)을 열어 다른 워커의 탭과 격리
+    drv.switch_to.new_window('tab')
+    drv.attached = True
+    try:
+        drv.execute_cdp_cmd("Network.enable", {})
+        drv.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception:
+        pass
+    print(f"✅ 공유 Chrome에 연결 (pid {os.getpid()}, port {attach_port})")
+    return drv
+
+
 def create_driver(headless=False, worker_id=None, base_profile_dir=TEMP_DATA_PATH, clone_profile=False, cleanup_clone=False, force_new_profile=False):
-    # Create a unique profile folder per worker to avoid profile lock conflicts
-    if clone_profile and worker_id is not None and not force_new_profile:
-        profile_dir = os.path.join(base_profile_dir, f"worker_{worker_id}")
-        # If base profile exists and clone doesn't exist, create a copy
-        if os.path.exists(base_profile_dir) and not os.path.exists(profile_dir):
-            try:
-                print(f"Cloning profile from {base_profile_dir} -> {profile_dir}")
-                shutil.copytree(base_profile_dir, profile_dir)
-            except Exception as e:
-                print(f"Failed to clone profile, creating fresh profile {profile_dir}: {e}")
-                os.makedirs(profile_dir, exist_ok=True)
-        elif not os.path.exists(profile_dir):
-            os.makedirs(profile_dir, exist_ok=True)
+    # Workers get a tiny throwaway profile instead of a copytree of the base profile
+    # (cache/history can be 100MB+); login state is restored from cookies after launch.
+    ephemeral = clone_profile and worker_id is not None and not force_new_profile
+    if ephemeral:
+        profile_dir = tempfile.mkdtemp(prefix=f'zippoom_w{worker_id}_')
     else:
         profile_dir = base_profile_dir if worker_id is None else os.path.join(base_profile_dir, f"worker_{worker_id}")
         if not os.path.exists(profile_dir):
@@ -99,6 +200,14 @@ def create_driver(headless=False, worker_id=None, base_profile_dir=TEMP_DATA_PAT
     options.add_argument("--window-size=1920,1080")
     options.add_argument("lang=ko_KR")
     options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+    if ephemeral:
+        options.add_argument("--incognito")
+    # 리뷰 텍스트만 필요하므로 이미지/폰트 로딩 차단 (네트워크/메모리 절감)
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
     if headless:
         # Use new headless mode for modern Chrome; fallback to legacy if needed
         try:
@@ -125,13 +234,13 @@ def create_driver(headless=False, worker_id=None, base_profile_dir=TEMP_DATA_PAT
     drv = None
     for attempt in range(2):
         try:
-            drv = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+            drv = webdriver.Chrome(service=Service(get_driver_path()), options=options)
             print(f"✅ 드라이버 세션 생성 성공 (worker {worker_id})")
             break
         except Exception as e:
             print(f"❌ 드라이버 세션 생성 실패 (worker {worker_id}) (attempt {attempt+1}): {e}")
-            # If cloning was used, try creating a fresh profile and retry once
-            if clone_profile and attempt == 0 and worker_id is not None:
+            # If an ephemeral profile was used, try creating a fresh one and retry once
+            if ephemeral and attempt == 0:
                 try:
                     if os.path.exists(profile_dir):
                         shutil.rmtree(profile_dir)
@@ -153,6 +262,14 @@ def create_driver(headless=False, worker_id=None, base_profile_dir=TEMP_DATA_PAT
         })
     except Exception:
         pass
+    # Block images/fonts/trackers at the network layer
+    try:
+        drv.execute_cdp_cmd("Network.enable", {})
+        drv.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception:
+        pass
+    # 임시 프로필 경로를 기록해 두고 종료 시 삭제
+    drv.ephemeral_profile_dir = profile_dir if ephemeral else None
     return drv
 
 def save_cookies(driver, cookie_file):
@@ -223,48 +340,193 @@ def is_logged_in(driver):
 
 
 def get_processed_indices(csv_path):
-    """CSV 파일에서 이미 처리된 인덱스 목록을 반환"""
+    """CSV 파일에서 이미 처리된 인덱스 목록을 반환 (source_index 컬럼만 스트리밍으로 읽음)"""
     if not os.path.exists(csv_path):
         return set()
     try:
-        df_existing = pd.read_csv(csv_path, on_bad_lines='skip')
-        if 'source_index' in df_existing.columns:
-            return set(df_existing['source_index'].unique())
-        return set()
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            r = csv.reader(f)
+            header = next(r, None)
+            if not header or 'source_index' not in header:
+                return set()
+            col = header.index('source_index')
+            # pandas로 저장된 과거 파일은 '12.0' 형태일 수 있어 float을 거쳐 변환
+            return {int(float(row[col])) for row in r if len(row) > col and row[col]}
     except Exception as e:
         print(f"Warning: CSV 파일 읽기 실패: {e}")
         return set()
 
 
-def append_to_csv(reviews_data, csv_path):
-    """리뷰 데이터를 CSV에 추가 저장"""
-    if not reviews_data:
+REVIEW_FIELDS = ['kaptName', 'doroJuso', 'Score', 'Pros', 'Cons', 'source_index', 'error']
+
+
+class CsvAppender:
+    """파일 핸들 하나를 유지하며 리뷰 행을 버퍼링해 flush_every 건마다 기록하는 CSV writer"""
+
+    def __init__(self, path, fieldnames=REVIEW_FIELDS, flush_every=64):
+        self.path = path
+        self.flush_every = flush_every
+        self._buf = []
+
+        # 기존 파일이 있으면 그 헤더를 그대로 따름 (이어쓰기 시 컬럼 순서 유지)
+        is_empty = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not is_empty:
+            with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+                header = next(csv.reader(f), None)
+            if header:
+                fieldnames = header
+
+        self._fh = open(path, 'a', encoding='utf-8-sig', newline='')
+        self._writer = csv.DictWriter(self._fh, fieldnames=fieldnames, extrasaction='ignore')
+        if is_empty:
+            self._writer.writeheader()
+            self._fh.flush()
+
+    def append_many(self, rows):
+        if not rows:
+            return
+        self._buf.extend(rows)
+        if len(self._buf) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self._buf:
+            self._writer.writerows(self._buf)
+            self._buf.clear()
+        self._fh.flush()
+
+    def close(self):
+        if self._fh.closed:
+            return
+        self.flush()
+        self._fh.close()
+
+
+# Selenium 로케이터 (모듈 상수로 한 번만 정의). 텍스트 조건이 필요 없는 곳은 CSS 사용
+# 검색창: 사이트 검색 input(enterkeyhint='search') 우선, 이후 일반적인 검색 input 패턴으로 fallback
+SEARCH_INPUT_SELECTORS = [
+    (By.CSS_SELECTOR, "input.absolute.z-20[enterkeyhint='search']"),
+    (By.CSS_SELECTOR, "input[enterkeyhint='search']"),
+    (By.CSS_SELECTOR, "input[type='search']"),
+    (By.CSS_SELECTOR, "input[type='text'][placeholder*='검색']"),
+    (By.CSS_SELECTOR, "input[type='text'][placeholder*='주소']"),
+    (By.CSS_SELECTOR, "input[type='text'][placeholder*='건물명']"),
+    (By.CSS_SELECTOR, "input[class*='search'], input[class*='Search']"),
+    (By.CSS_SELECTOR, "input[placeholder*='검색'], input[placeholder*='주소'], input[placeholder*='건물명']"),
+    (By.CSS_SELECTOR, "input[role='searchbox']"),
+]
+# 텍스트 매칭이 필요한 요소는 XPath 유지
+SEL_RESULT = (By.XPATH, "//button[.//span[contains(text(), '도로명')]]")
+SEL_REVIEW_TAB = (By.XPATH, "//p[contains(@class, 'cursor-pointer') and contains(., '리뷰')]")
+SEL_MORE = (By.XPATH, "//button[contains(., '거주 후기 더보기')]")
+SEL_REVIEW = (By.CSS_SELECTOR, "[data-testid='리뷰']")
+
+
+# 리뷰 블록의 '전체 보기' 버튼을 한 번에 모두 클릭
+EXPAND_REVIEWS_JS = """
+document.querySelectorAll('[data-testid="리뷰"] p').forEach(p => {
+  if (p.textContent.includes('전체 보기') && p.parentElement) p.parentElement.click();
+});
+"""
+
+# 모든 리뷰 블록에서 점수/장점/단점을 한 번에 추출해 JSON 배열로 반환
+EXTRACT_REVIEWS_JS = """
+const label = (n, text) => {
+  const p = Array.from(n.querySelectorAll('p')).find(p => p.innerText.trim() === text);
+  const next = p ? p.nextElementSibling : null;
+  return next ? next.innerText : '';
+};
+return Array.from(document.querySelectorAll('[data-testid="리뷰"]')).map(n => {
+  const score = n.querySelector('p.font-bold');
+  return {score: score ? score.innerText : null, pros: label(n, '장점'), cons: label(n, '단점')};
+});
+"""
+
+
+def get_pending_rows(processed_indices):
+    """아직 처리되지 않은 (idx, kaptName, doroJuso, juso_valid) 목록 (행마다 Series를 만들지 않도록 컬럼 배열을 zip)
+
+    아파트 이름이 비어 있는 행은 검색해도 결과가 없으므로 작업 목록에서 제외.
+    """
+    names = df['kaptName'].to_numpy(object)
+    jusos = df['doroJuso'].to_numpy(object)
+    valid = df['_juso_valid'].to_numpy(bool)
+    name_valid = df['_name_valid'].to_numpy(bool)
+    return [(i, k, d, bool(v)) for i, (k, d, v, nv) in enumerate(zip(names, jusos, valid, name_valid))
+            if nv and i not in processed_indices]
+
+
+def build_search_candidates(doro_juso, kapt_name, juso_valid):
+    """검색 전략 수립: 유효한 도로명 주소가 있으면 먼저, 그 다음 아파트 이름"""
+    search_candidates = []
+    if juso_valid:
+        search_candidates.append((doro_juso, "도로명 주소"))
+    search_candidates.append((kapt_name, "아파트 이름"))
+    return search_candidates
+
+
+def ensure_search_page(driver, wait, reload=False):
+    """검색 페이지가 이미 열려 있으면 재사용하고, 상세 페이지라면 뒤로 가기로 복귀 (실패 시에만 새로 로드)
+
+    /search를 매 행마다 새로 열면 React 앱 부트스트랩 비용을 매번 치르므로,
+    같은 탭에서 검색창만 지우고 다시 입력하도록 한다. reload=True면 항상 새로 로드.
+    """
+    if not reload and urlparse(driver.current_url).path.rstrip('/') == '/search':
         return
-    
-    df_new = pd.DataFrame(reviews_data)
-    
-    # 파일이 없거나 비어있으면 헤더 포함해서 생성
-    if not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0:
-        df_new.to_csv(csv_path, index=False, encoding='utf-8-sig')
-    else:
-        # 파일이 있으면 헤더 없이 추가
-        df_new.to_csv(csv_path, mode='a', header=False, index=False, encoding='utf-8-sig')
+    if not reload and urlparse(driver.current_url).netloc.endswith('zippoom.com'):
+        try:
+            driver.back()
+            # 리뷰 탭 등으로 히스토리가 더 쌓였을 수 있으므로 짧게만 기다리고 안 되면 새로 로드
+            WebDriverWait(driver, 3).until(lambda d: urlparse(d.current_url).path.rstrip('/') == '/search')
+            return
+        except Exception:
+            pass
+    driver.get("https://zippoom.com/search")
+    # 고정 sleep 대신 문서 로딩 완료까지만 대기 (검색창은 selector 대기에서 확인)
+    wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
 
 
-def crawl_zippoom(doro_juso, kapt_name, driver):
+def submit_search(driver, wait, keyword):
+    """검색창을 찾아 기존 입력을 지우고 keyword를 입력한 뒤 엔터 (성공 여부 반환)"""
+    input_success = False
+    attempts = 0
+    while not input_success and attempts < 3:
+        try:
+            attempts += 1
+            real_input = None
+            for sel in SEARCH_INPUT_SELECTORS:
+                try:
+                    real_input = wait.until(EC.element_to_be_clickable(sel))
+                    if real_input:
+                        break
+                except Exception:
+                    # ignore and try next selector
+                    continue
+
+            if not real_input:
+                raise Exception("검색 input을 찾을 수 없습니다.")
+
+            # Use ActionChains to move to the element, click, and type using keyboard
+            ac = ActionChains(driver)
+            ac.move_to_element(real_input).click().send_keys(Keys.CONTROL + "a").send_keys(Keys.BACKSPACE).send_keys(keyword).pause(0.2).send_keys(Keys.RETURN).perform()
+
+            input_success = True
+            print(f"  👉 [Step 1] 입력 성공 (시도 {attempts}회)")
+
+        except (StaleElementReferenceException, ElementClickInterceptedException):
+            print(f"  ⚠️ 요소가 변경됨(Stale). 재시도 중... ({attempts}/3)")
+            time.sleep(1 + random.uniform(0, 0.3))
+        except Exception as e:
+            print(f"  ⚠️ 입력 중 일반 에러: {e}")
+            break
+    return input_success
+
+
+def crawl_zippoom(doro_juso, kapt_name, driver, juso_valid):
     collected_reviews = []
     
     # 1. 검색 전략 수립
-    search_candidates = []
-    is_valid_juso = False
-    if doro_juso is not None:
-        if isinstance(doro_juso, float):
-            if not math.isnan(doro_juso): is_valid_juso = True
-        elif str(doro_juso).strip().lower() != 'nan' and str(doro_juso).strip() != "":
-            is_valid_juso = True
-
-    if is_valid_juso: search_candidates.append((doro_juso, "도로명 주소"))
-    search_candidates.append((kapt_name, "아파트 이름"))
+    search_candidates = build_search_candidates(doro_juso, kapt_name, juso_valid)
     
     print(f"\n🔍 크롤링 시작 대상: {kapt_name}")
 
@@ -275,62 +537,25 @@ def crawl_zippoom(doro_juso, kapt_name, driver):
         
         try:
             # Use the search page directly so we can type into the visible search field
-            driver.get("https://zippoom.com/search")
-            # 페이지 로딩 후 React가 안정을 찾을 때까지 조금 넉넉히 대기
-            time.sleep(2 + random.uniform(0, 0.3)) 
-            
             wait = WebDriverWait(driver, 10)
+            ensure_search_page(driver, wait)
             
             # =========================================================
             # [Step 1] 검색창 선택 및 입력 (검색 페이지에서 직접 키 입력)
             # We load the /search page, locate visible input field and type using send_keys
             # =========================================================
-            input_success = False
-            attempts = 0
-            # Prefer the specific input with enterkeyhint='search' (site's search box)
-            input_selectors = [
-                # exact target per user's request: clickable input with the class
-                "//input[contains(@class, 'absolute') and contains(@class, 'z-20') and @enterkeyhint='search']",
-                "//input[@enterkeyhint='search']",
-                # fallback: search type or placeholder/class matches
-                "//input[@type='search']",
-                "//input[@type='text' and contains(@placeholder, '검색')]",
-                "//input[@type='text' and contains(@placeholder, '주소')]",
-                "//input[@type='text' and contains(@placeholder, '건물명')]",
-                "//input[contains(@class, 'search') or contains(@class, 'Search') or contains(@class, 'searchInput')]",
-                "//input[contains(@placeholder, '검색') or contains(@placeholder, '주소') or contains(@placeholder, '건물명')]",
-                "//input[@role='searchbox']",
-            ]
-
-            while not input_success and attempts < 3:
+            # 이전 검색 결과가 남아 있으면 새 결과로 교체될 때까지 기다려야 엉뚱한 단지를 클릭하지 않음
+            old_results = driver.find_elements(*SEL_RESULT)
+            input_success = submit_search(driver, wait, keyword)
+
+            if input_success and old_results:
                 try:
-                    attempts += 1
-                    real_input = None
-                    for sel in input_selectors:
-                        try:
-                            real_input = wait.until(EC.element_to_be_clickable((By.XPATH, sel)))
-                            if real_input:
-                                break
-                        except Exception:
-                            # ignore and try next selector
-                            continue
-
-                    if not real_input:
-                        raise Exception("검색 input을 찾을 수 없습니다.")
-
-                    # Use ActionChains to move to the element, click, and type using keyboard
-                    ac = ActionChains(driver)
-                    ac.move_to_element(real_input).click().send_keys(Keys.CONTROL + "a").send_keys(Keys.BACKSPACE).send_keys(keyword).pause(0.2).send_keys(Keys.RETURN).perform()
-
-                    input_success = True
-                    print(f"  👉 [Step 1] 입력 성공 (시도 {attempts}회)")
-
-                except (StaleElementReferenceException, ElementClickInterceptedException):
-                    print(f"  ⚠️ 요소가 변경됨(Stale). 재시도 중... ({attempts}/3)")
-                    time.sleep(1 + random.uniform(0, 0.3))
-                except Exception as e:
-                    print(f"  ⚠️ 입력 중 일반 에러: {e}")
-                    break
+                    wait.until(EC.staleness_of(old_results[0]))
+                except TimeoutException:
+                    # 결과 목록이 갱신되지 않으면 빈 검색 페이지를 새로 열어 다시 검색
+                    print("  ⚠️ 이전 검색 결과가 그대로 남아 있음. 검색 페이지를 새로 로드합니다.")
+                    ensure_search_page(driver, wait, reload=True)
+                    input_success = submit_search(driver, wait, keyword)
 
             if not input_success:
                 print("  ❌ 검색어 입력 실패. 다음 전략으로.")
@@ -339,14 +564,12 @@ def crawl_zippoom(doro_juso, kapt_name, driver):
             # =========================================================
             # [Step 2] 결과 확인 및 클릭
             # =========================================================
-            time.sleep(3 + random.uniform(0, 0.3))
-            xpath_result = "//button[.//span[contains(text(), '도로명')]]"
-            first_result = wait.until(EC.element_to_be_clickable((By.XPATH, xpath_result)))
+            wait.until(EC.presence_of_all_elements_located(SEL_RESULT))
+            first_result = wait.until(EC.element_to_be_clickable(SEL_RESULT))
             
             driver.execute_script("arguments[0].click();", first_result)
             print(f"  ✅ 검색 성공! 상세 페이지로 이동합니다.")
             success_search = True
-            time.sleep(3 + random.uniform(0, 0.3))
             break 
             
         except Exception as e:
@@ -361,12 +584,12 @@ def crawl_zippoom(doro_juso, kapt_name, driver):
     # [Step 3] 리뷰 탭 클릭
     # =========================================================
     try:
-        wait = WebDriverWait(driver, 5)
-        xpath_tab = "//p[contains(@class, 'cursor-pointer') and contains(., '리뷰')]"
-        review_tab = wait.until(EC.element_to_be_clickable((By.XPATH, xpath_tab)))
+        # 상세 페이지 전환을 기다리며 리뷰 탭이 나타날 때까지 대기
+        wait = WebDriverWait(driver, 10)
+        review_tab = wait.until(EC.element_to_be_clickable(SEL_REVIEW_TAB))
         driver.execute_script("arguments[0].click();", review_tab)
         print("  👉 리뷰 탭 클릭 성공")
-        time.sleep(2 + random.uniform(0, 0.3))
+        WebDriverWait(driver, 5).until(EC.presence_of_element_located(SEL_REVIEW))
     except:
         print("  ℹ️ 리뷰 탭 클릭 건너뜀")
 
@@ -377,51 +600,465 @@ def crawl_zippoom(doro_juso, kapt_name, driver):
     while True:
         try:
             more_btn = WebDriverWait(driver, 3).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(., '거주 후기 더보기')]"))
+                EC.element_to_be_clickable(SEL_MORE)
             )
+            prev_count = len(driver.find_elements(*SEL_REVIEW))
             driver.execute_script("arguments[0].click();", more_btn)
-            time.sleep(1 + random.uniform(0, 0.3))
+            # 리뷰 블록 수가 늘어날 때까지만 대기 (늘지 않으면 더 불러올 리뷰가 없는 것으로 간주)
+            WebDriverWait(driver, 5).until(lambda d: len(d.find_elements(*SEL_REVIEW)) > prev_count)
         except:
             break 
 
     driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(1 + random.uniform(0, 0.3))
 
     # =========================================================
     # [Step 5] 데이터 추출
     # =========================================================
-    review_blocks = driver.find_elements(By.XPATH, "//div[@data-testid='리뷰']")
-    
-    for block in review_blocks:
-        review_item = {'kaptName': kapt_name, 'doroJuso': doro_juso, 'Score': None, 'Pros': None, 'Cons': None}
-        
-        try:
-            full_btn = block.find_element(By.XPATH, ".//p[contains(text(), '전체 보기')]/..")
-            driver.execute_script("arguments[0].click();", full_btn)
-            time.sleep(0.1 + random.uniform(0, 0.3))
-        except: pass
-
-        try: review_item['Score'] = block.find_element(By.XPATH, ".//p[contains(@class, 'font-bold')]").text
-        except: pass
-        try: review_item['Pros'] = block.find_element(By.XPATH, ".//p[text()='장점']/following-sibling::p[1]").text
-        except: review_item['Pros'] = ""
-        try: review_item['Cons'] = block.find_element(By.XPATH, ".//p[text()='단점']/following-sibling::p[1]").text
-        except: review_item['Cons'] = ""
-        
-        collected_reviews.append(review_item)
+    # 브라우저 왕복을 줄이기 위해 '전체 보기' 펼치기 1회 + 추출 1회의 JS 호출로 처리
+    driver.execute_script(EXPAND_REVIEWS_JS)
+    for r in driver.execute_script(EXTRACT_REVIEWS_JS) or []:
+        collected_reviews.append({'kaptName': kapt_name, 'doroJuso': doro_juso,
+                                  'Score': r.get('score'), 'Pros': r.get('pros', ''), 'Cons': r.get('cons', '')})
 
     print(f"  🎉 수집 완료: {len(collected_reviews)}건")
     return collected_reviews
 
 
+# =========================================================
+# Playwright (async) 엔진: 브라우저 컨텍스트 풀로 동시 크롤링
+# =========================================================
+async def crawl_zippoom_async(context, doro_juso, kapt_name, juso_valid):
+    """crawl_zippoom과 동일한 흐름을 Playwright async API로 수행 (컨텍스트당 새 탭 사용)"""
+    collected_reviews = []
+    search_candidates = build_search_candidates(doro_juso, kapt_name, juso_valid)
+
+    print(f"\n🔍 크롤링 시작 대상: {kapt_name}")
+
+    page = await context.new_page()
+    try:
+        success_search = False
+        for keyword, desc in search_candidates:
+            print(f"  🔄 전략 시도: '{desc}'로 검색 ({keyword})")
+            try:
+                await page.goto("https://zippoom.com/search")
+
+                # [Step 1] 검색창이 보일 때까지 대기 후 입력
+                await page.wait_for_selector("input[enterkeyhint=search]", state="visible", timeout=10000)
+                await page.locator("input[enterkeyhint=search]").first.fill(str(keyword))
+                await page.keyboard.press("Enter")
+
+                # [Step 2] 결과 확인 및 클릭
+                await page.wait_for_selector("button:has(span:has-text('도로명'))", state="visible", timeout=10000)
+                await page.locator("button:has(span:has-text('도로명'))").first.click()
+                await page.wait_for_load_state("domcontentloaded")
+                print(f"  ✅ 검색 성공! 상세 페이지로 이동합니다.")
+                success_search = True
+                break
+            except Exception as e:
+                print(f"  ⚠️ 실패: {desc} 검색 결과 없음 ({e})")
+                continue
+
+        if not success_search:
+            print("  ❌ 모든 검색 전략 실패. 다음 아파트로 넘어갑니다.")
+            return []
+
+        # [Step 3] 리뷰 탭 클릭
+        try:
+            await page.locator("p.cursor-pointer:has-text('리뷰')").first.click(timeout=5000)
+            print("  👉 리뷰 탭 클릭 성공")
+        except Exception:
+            print("  ℹ️ 리뷰 탭 클릭 건너뜀")
+
+        # [Step 4] '더보기' 반복 클릭
+        print("  🔄 리뷰 전체 로딩 중...")
+        more_btn = page.locator("button:has-text('거주 후기 더보기')")
+        while await more_btn.count():
+            try:
+                prev_count = await page.locator("[data-testid=리뷰]").count()
+                await more_btn.first.click(timeout=3000)
+                # 리뷰 블록 수가 늘어날 때까지만 대기 (늘지 않으면 종료)
+                await page.wait_for_function(
+                    "n => document.querySelectorAll('[data-testid=\"리뷰\"]').length > n",
+                    arg=prev_count, timeout=5000,
+                )
+            except Exception:
+                break
+
+        # [Step 5] 데이터 추출
+        await page.evaluate(f"() => {{ {EXPAND_REVIEWS_JS} }}")
+        for r in await page.evaluate(f"() => {{ {EXTRACT_REVIEWS_JS} }}") or []:
+            collected_reviews.append({'kaptName': kapt_name, 'doroJuso': doro_juso,
+                                      'Score': r.get('score'), 'Pros': r.get('pros', ''), 'Cons': r.get('cons', '')})
+
+        print(f"  🎉 수집 완료: {len(collected_reviews)}건")
+        return collected_reviews
+    finally:
+        await page.close()
+
+
+def _to_playwright_cookies(cookie_file):
+    """Selenium save_cookies 포맷(JSON)을 Playwright add_cookies 포맷으로 변환"""
+    try:
+        with open(cookie_file, 'r', encoding='utf-8') as f:
+            cookies = json.load(f)
+    except Exception as e:
+        print(f"Failed to load cookies from {cookie_file}: {e}")
+        return []
+
+    converted = []
+    for c in cookies:
+        cookie = {
+            'name': c['name'],
+            'value': c['value'],
+            'domain': c.get('domain', 'zippoom.com'),
+            'path': c.get('path', '/'),
+        }
+        if 'expiry' in c:
+            try:
+                cookie['expires'] = int(c['expiry'])
+            except Exception:
+                pass
+        if 'httpOnly' in c:
+            cookie['httpOnly'] = bool(c['httpOnly'])
+        if 'secure' in c:
+            cookie['secure'] = bool(c['secure'])
+        converted.append(cookie)
+    return converted
+
+
+async def _block_heavy_resources(route):
+    """Playwright route 핸들러: 이미지/폰트/미디어 요청은 중단"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def run_playwright(args, pending_rows, appender):
+    """브라우저 프로세스 1개에 K개의 BrowserContext를 만들고, 컨텍스트별 워커가 공용 큐에서 행을 가져가 처리"""
+    workers = max(1, args.workers)
+    cookies = _to_playwright_cookies(args.cookies_file) if args.reuse_cookies and os.path.exists(args.cookies_file) else []
+
+    queue = asyncio.Queue()
+    for row in pending_rows:
+        queue.put_nowait(row)
+
+    async with async_playwright() as p:
+        # 컨텍스트는 쿠키/스토리지가 격리된 가벼운 세션이므로 Chromium 하나를 공유 (로그인은 쿠키로 복원)
+        browser = await p.chromium.launch(
+            headless=args.headless,
+            args=["--disable-blink-features=AutomationControlled"],
+        )
+        contexts = []
+        for _ in range(workers):
+            ctx = await browser.new_context(
+                locale="ko-KR",
+                viewport={"width": 1920, "height": 1080},
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            )
+            await ctx.route("**/*", _block_heavy_resources)
+            if cookies:
+                await ctx.add_cookies(cookies)
+            contexts.append(ctx)
+        print(f"✅ Playwright 컨텍스트 {workers}개 생성")
+
+        async def worker(ctx):
+            while True:
+                try:
+                    idx, kapt_name, doro_juso, juso_valid = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                print(f"\n[{idx+1}] 크롤링 시작: {kapt_name}")
+                try:
+                    reviews = await crawl_zippoom_async(ctx, doro_juso, kapt_name, juso_valid)
+                    for review in reviews:
+                        review['source_index'] = idx
+                    if not reviews:
+                        reviews = [{
+                            'kaptName': kapt_name,
+                            'doroJuso': doro_juso,
+                            'Score': None,
+                            'Pros': None,
+                            'Cons': None,
+                            'source_index': idx
+                        }]
+                except Exception as e:
+                    print(f"  ⚠️ 에러 발생: {e}")
+                    reviews = [{
+                        'kaptName': kapt_name,
+                        'doroJuso': doro_juso,
+                        'Score': None,
+                        'Pros': None,
+                        'Cons': None,
+                        'source_index': idx,
+                        'error': str(e)
+                    }]
+                # 이벤트 루프가 단일 스레드이므로 append 간 경합 없음
+                appender.append_many(reviews)
+                print(f"  ✅ 저장 버퍼에 추가: {len(reviews)}건")
+                await asyncio.sleep(1 + random.uniform(0, 0.3))
+
+        try:
+            await asyncio.gather(*(worker(ctx) for ctx in contexts))
+        finally:
+            await browser.close()
+
+
+# =========================================================
+# API 엔진: 브라우저 없이 리뷰 JSON 엔드포인트를 httpx로 직접 호출
+# =========================================================
+# Zippoom이 SPA에서 호출하는 XHR 주소를 DevTools(Network 탭)에서 확인해 설정한다.
+#   ZIPPOOM_SEARCH_API  : 검색 API, '{q}' 자리에 검색어가 들어감
+#   ZIPPOOM_REVIEWS_API : 리뷰 API, '{building_id}', '{cursor}' 자리 포함
+# 설정되지 않았거나 403(차단)이 오면 Selenium 경로로 넘어간다.
+ZIPPOOM_SEARCH_API = os.getenv('ZIPPOOM_SEARCH_API')
+ZIPPOOM_REVIEWS_API = os.getenv('ZIPPOOM_REVIEWS_API')
+
+
+class ApiBlocked(Exception):
+    """API가 403 등으로 차단되어 브라우저 크롤링으로 대체해야 하는 경우"""
+
+
+class ApiSchemaError(Exception):
+    """응답 JSON 구조를 해석할 수 없는 경우 (설정한 엔드포인트가 예상과 다름)
+
+    빈 결과로 처리하면 해당 행이 '리뷰 없음'으로 기록되어 재실행 시에도 건너뛰므로,
+    행을 미처리 상태로 남기고 브라우저 크롤링으로 대체한다.
+    """
+
+
+_REVIEW_FIELDS = ('score', 'pros', 'advantage', 'cons', 'disadvantage')
+
+
+def _json_items(payload):
+    """응답 JSON에서 항목 리스트를 꺼냄 (최상위 list 또는 data/items/reviews/content 키)
+
+    알 수 없는 구조면 None을 반환 (빈 리스트는 '결과 없음'으로 구분).
+    """
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        for key in ('data', 'items', 'reviews', 'content', 'results'):
+            value = payload.get(key)
+            if isinstance(value, list):
+                return value
+            if isinstance(value, dict):
+                nested = _json_items(value)
+                if nested is not None:
+                    return nested
+    return None
+
+
+async def _get_json(client, url):
+    resp = await client.get(url)
+    if resp.status_code in (401, 403, 429):
+        raise ApiBlocked(f"{resp.status_code} {url}")
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def fetch_reviews_api(client, doro_juso, kapt_name, juso_valid):
+    """검색 API로 단지 id를 찾고 리뷰 API를 cursor가 끝날 때까지 페이지네이션"""
+    building_id = None
+    for keyword, desc in build_search_candidates(doro_juso, kapt_name, juso_valid):
+        items = _json_items(await _get_json(client, ZIPPOOM_SEARCH_API.format(q=quote(str(keyword)))))
+        if items is None:
+            raise ApiSchemaError(f"검색 응답 구조를 알 수 없음 ({desc}: {keyword})")
+        if items:
+            first = items[0]
+            building_id = (first.get('id') or first.get('buildingId')) if isinstance(first, dict) else None
+            if building_id is None:
+                raise ApiSchemaError(f"검색 결과에서 단지 id를 찾을 수 없음 ({desc}: {keyword})")
+            break
+
+    if building_id is None:
+        return []
+
+    collected_reviews = []
+    cursor = ''
+    while True:
+        payload = await _get_json(client, ZIPPOOM_REVIEWS_API.format(building_id=building_id, cursor=quote(str(cursor))))
+        page = _json_items(payload)
+        if page is None:
+            raise ApiSchemaError(f"리뷰 응답 구조를 알 수 없음 (building_id={building_id})")
+        if not page:
+            break
+        for it in page:
+            if not isinstance(it, dict) or not any(field in it for field in _REVIEW_FIELDS):
+                raise ApiSchemaError(f"리뷰 항목에 점수/장단점 필드가 없음 (building_id={building_id})")
+            collected_reviews.append({
+                'kaptName': kapt_name,
+                'doroJuso': doro_juso,
+                'Score': it.get('score'),
+                'Pros': it.get('pros') or it.get('advantage') or '',
+                'Cons': it.get('cons') or it.get('disadvantage') or '',
+            })
+        prev_cursor = cursor
+        cursor = payload.get('nextCursor') if isinstance(payload, dict) else None
+        # 같은 cursor가 반복되면 같은 페이지를 무한히 받게 되므로 중단
+        if not cursor or cursor == prev_cursor:
+            break
+    return collected_reviews
+
+
+async def run_api(args, pending_rows, appender, processed_indices):
+    """API로 가능한 행을 동시에 처리. 차단되면 남은 행은 processed_indices에 추가되지 않은 채로 남김"""
+    sem = asyncio.Semaphore(max(1, args.workers))
+    blocked = asyncio.Event()
+    headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}
+
+    async with httpx.AsyncClient(headers=headers, timeout=10.0, follow_redirects=True) as client:
+        async def one(idx, kapt_name, doro_juso, juso_valid):
+            async with sem:
+                if blocked.is_set():
+                    return
+                try:
+                    reviews = await fetch_reviews_api(client, doro_juso, kapt_name, juso_valid)
+                except ApiBlocked as e:
+                    print(f"  ⛔ API 차단 감지, 브라우저 크롤링으로 전환: {e}")
+                    blocked.set()
+                    return
+                except ApiSchemaError as e:
+                    # 엔드포인트 설정 문제는 모든 행에 해당하므로 API 처리를 멈추고 행은 미처리로 남김
+                    print(f"  ⛔ API 응답 형식 불일치, 브라우저 크롤링으로 전환: {e}")
+                    blocked.set()
+                    return
+                except Exception as e:
+                    print(f"  ⚠️ API 에러 ({kapt_name}): {e}")
+                    return
+                for review in reviews:
+                    review['source_index'] = idx
+                if not reviews:
+                    reviews = [{'kaptName': kapt_name, 'doroJuso': doro_juso, 'Score': None,
+                                'Pros': None, 'Cons': None, 'source_index': idx}]
+                appender.append_many(reviews)
+                processed_indices.add(idx)
+                print(f"[{idx+1}] API 수집 완료: {kapt_name} ({len(reviews)}건)")
+
+        await asyncio.gather(*(one(*row) for row in pending_rows))
+
+
+# =========================================================
+# Selenium 멀티프로세스 풀: 워커 프로세스마다 복제 프로필 드라이버 1개
+# =========================================================
+def crawl_row(idx, kapt_name, doro_juso, juso_valid, driver):
+    """한 행을 크롤링해 source_index가 붙은 리뷰 리스트를 반환 (빈 결과/에러도 기록용 레코드로 반환)"""
+    try:
+        reviews = crawl_zippoom(doro_juso, kapt_name, driver, juso_valid)
+
+        # 각 리뷰에 source_index 추가
+        for review in reviews:
+            review['source_index'] = idx
+
+        # 리뷰가 없어도 처리 완료 기록
+        if not reviews:
+            reviews = [{
+                'kaptName': kapt_name,
+                'doroJuso': doro_juso,
+                'Score': None,
+                'Pros': None,
+                'Cons': None,
+                'source_index': idx
+            }]
+        return reviews
+
+    except Exception as e:
+        print(f"  ⚠️ 에러 발생: {e}")
+        # 에러가 발생해도 처리 완료로 기록 (무한 루프 방지)
+        return [{
+            'kaptName': kapt_name,
+            'doroJuso': doro_juso,
+            'Score': None,
+            'Pros': None,
+            'Cons': None,
+            'source_index': idx,
+            'error': str(e)
+        }]
+
+
+_worker_args = None
+_worker_driver = None
+
+
+def _quit_worker_driver():
+    global _worker_driver
+    if _worker_driver is not None:
+        try:
+            if getattr(_worker_driver, 'attached', False):
+                # 공유 Chrome은 부모가 종료하므로 이 워커의 탭만 닫음
+                _worker_driver.close()
+            _worker_driver.quit()
+        except Exception:
+            pass
+        profile_dir = getattr(_worker_driver, 'ephemeral_profile_dir', None)
+        if profile_dir:
+            _discard_profile_dir(profile_dir)
+        _worker_driver = None
+
+
+def _discard_profile_dir(profile_dir):
+    """워커 프로필 정리: 파일 수천 개를 하나씩 지우는 대신 휴지통 디렉터리로 rename만 하고,
+    실제 삭제는 부모 프로세스 종료 시 한 번에 처리 (휴지통이 없거나 rename 실패 시 즉시 삭제)"""
+    trash_dir = getattr(_worker_args, 'trash_dir', None)
+    if trash_dir:
+        try:
+            os.rename(profile_dir, os.path.join(trash_dir, f'w{os.getpid()}_{uuid.uuid4().hex}'))
+            return
+        except OSError:
+            pass
+    shutil.rmtree(profile_dir, ignore_errors=True)
+
+
+def _init_worker(args, driver_path=None):
+    """Pool initializer: CLI 인자와 부모가 해석한 chromedriver 경로를 워커 전역에 보관 (드라이버는 첫 작업 시 생성)"""
+    global _worker_args, _DRIVER_PATH
+    _worker_args = args
+    if driver_path:
+        _DRIVER_PATH = driver_path
+    # Pool 워커는 os._exit로 종료되어 atexit이 실행되지 않으므로 multiprocessing Finalize 사용
+    mp_util.Finalize(None, _quit_worker_driver, exitpriority=10)
+
+
+def _get_worker_driver():
+    global _worker_driver
+    if _worker_driver is None:
+        args = _worker_args
+        # 모든 워커가 동시에 Chrome을 띄우고 /search에 몰리지 않도록 첫 드라이버 생성만 짧게 무작위 지연
+        time.sleep(random.uniform(0.1, 1.5))
+        if getattr(args, 'attach_port', None):
+            # 공유 Chrome은 기본 프로필을 그대로 쓰므로 쿠키 주입 불필요
+            _worker_driver = attach_driver(args.attach_port)
+            return _worker_driver
+        _worker_driver = create_driver(headless=args.headless, worker_id=os.getpid(),
+                                       base_profile_dir=args.profile_dir, clone_profile=True)
+        # 워커 프로필은 비어 있으므로 로그인 상태가 필요하면 --reuse-cookies로 저장한 쿠키를 주입
+        if args.reuse_cookies and os.path.exists(args.cookies_file):
+            load_cookies(_worker_driver, args.cookies_file, url='https://zippoom.com/')
+    return _worker_driver
+
+
+def process_row(idx_row_tuple):
+    """Pool 작업 단위: (idx, kapt_name, doro_juso) -> 리뷰 리스트 (CSV 저장은 부모 프로세스가 담당)"""
+    idx, kapt_name, doro_juso, juso_valid = idx_row_tuple
+    print(f"\n[{idx+1}] (pid {os.getpid()}) 크롤링 시작: {kapt_name}")
+    reviews = crawl_row(idx, kapt_name, doro_juso, juso_valid, _get_worker_driver())
+    time.sleep(1 + random.uniform(0, 0.3))
+    return reviews
+
+
 def main():
-    parser = argparse.ArgumentParser(description="Zippoom review crawler (sequential mode)")
+    parser = argparse.ArgumentParser(description="Zippoom review crawler")
     parser.add_argument('--headless', action='store_true', help='Run Chrome in headless mode')
+    parser.add_argument('--engine', choices=['selenium', 'playwright', 'api'], default='selenium', help="Crawl engine ('api' falls back to selenium)")
+    parser.add_argument('--workers', type=int, default=1, help='Concurrency: worker processes (selenium), contexts (playwright) or in-flight requests (api)')
     parser.add_argument('--save', type=str, default='리뷰_구조화_결과.csv', help='Output CSV file')
     parser.add_argument('--cookies-file', type=str, default='cookies.json', help='Path to cookies file to save/load')
     parser.add_argument('--record-cookies', action='store_true', help='Open browser for manual login and save cookies to --cookies-file')
-    parser.add_argument('--reuse-cookies', action='store_true', help='Load cookies from --cookies-file before crawling')
+    parser.add_argument('--reuse-cookies', action='store_true', help='Load cookies from --cookies-file before crawling (pool workers start from empty profiles, so pass this to keep a login with --workers N)')
     parser.add_argument('--profile-dir', type=str, default=TEMP_DATA_PATH, help='Base profile directory to reuse')
+    parser.add_argument('--flush-every', type=int, default=64, help='Flush buffered CSV rows every N rows (1 = durable after every apartment)')
+    parser.add_argument('--shared-chrome', action='store_true', help='Selenium workers attach to one Chrome via CDP instead of launching their own')
+    parser.add_argument('--debug-port', type=int, default=9222, help='Remote debugging port for --shared-chrome')
     args = parser.parse_args()
 
     # 쿠키 저장 모드
@@ -449,6 +1086,66 @@ def main():
     else:
         print(f"전체 항목: {total_rows}개")
 
+    # 결과 CSV writer (버퍼링, 종료 시 자동 flush)
+    appender = CsvAppender(args.save, flush_every=max(1, args.flush_every))
+    atexit.register(appender.close)
+
+    # API 엔진: 엔드포인트가 설정되어 있으면 브라우저 없이 먼저 처리, 남은 행은 Selenium으로
+    if args.engine == 'api':
+        if httpx is None:
+            print("⚠️ httpx가 설치되어 있지 않음 (pip install httpx) → Selenium으로 진행")
+        elif not (ZIPPOOM_SEARCH_API and ZIPPOOM_REVIEWS_API):
+            print("⚠️ ZIPPOOM_SEARCH_API / ZIPPOOM_REVIEWS_API 미설정 → Selenium으로 진행")
+        else:
+            pending_rows = get_pending_rows(processed_indices)
+            asyncio.run(run_api(args, pending_rows, appender, processed_indices))
+            # 이름 없는 행은 처리 대상에서 빠지므로 행 수 비교가 아니라 남은 작업 목록으로 판단
+            remaining = get_pending_rows(processed_indices)
+            if not remaining:
+                appender.close()
+                print(f"\n✅ 크롤링 완료! 결과는 '{args.save}'에 저장되었습니다.")
+                return
+            print(f"남은 {len(remaining)}개 항목은 Selenium으로 처리합니다.")
+
+    # Playwright 엔진: 컨텍스트 풀로 동시 처리
+    if args.engine == 'playwright':
+        if async_playwright is None:
+            raise SystemExit("playwright가 설치되어 있지 않습니다: pip install playwright && playwright install chromium")
+        pending_rows = get_pending_rows(processed_indices)
+        asyncio.run(run_playwright(args, pending_rows, appender))
+        appender.close()
+        print(f"\n✅ 크롤링 완료! 결과는 '{args.save}'에 저장되었습니다.")
+        return
+
+    # Selenium 멀티프로세스 모드: 프로세스마다 독립 드라이버, 결과는 부모에서만 기록
+    if args.workers > 1:
+        pending_rows = get_pending_rows(processed_indices)
+        shared_chrome = None
+        args.attach_port = None
+        # 워커 프로필은 종료 시 여기로 옮겨 두고 부모가 마지막에 일괄 삭제
+        args.trash_dir = tempfile.mkdtemp(prefix='zippoom_trash_')
+        atexit.register(shutil.rmtree, args.trash_dir, ignore_errors=True)
+        if args.shared_chrome:
+            shared_chrome = launch_shared_chrome(args.debug_port, args.profile_dir, headless=args.headless)
+            args.attach_port = args.debug_port
+        try:
+            with mp.Pool(args.workers, initializer=_init_worker, initargs=(args, get_driver_path())) as pool:
+                # imap_unordered: 느린 페이지가 빠른 페이지를 막지 않도록 완료 순서대로 수신
+                results = pool.imap_unordered(process_row, pending_rows, chunksize=4)
+                for reviews in tqdm(results, total=len(pending_rows), desc="crawl", unit="apt"):
+                    appender.append_many(reviews)
+                    processed_indices.add(reviews[0]['source_index'])
+                    print(f"  ✅ 저장 버퍼에 추가: {len(reviews)}건 (source_index {reviews[0]['source_index']})")
+                # terminate 전에 정상 종료시켜 워커의 드라이버 Finalize가 실행되도록 함
+                pool.close()
+                pool.join()
+        finally:
+            if shared_chrome is not None:
+                shared_chrome.terminate()
+        appender.close()
+        print(f"\n✅ 크롤링 완료! 결과는 '{args.save}'에 저장되었습니다.")
+        return
+
     # 드라이버 생성
     driver = None
     try:
@@ -463,55 +1160,16 @@ def main():
             else:
                 print("⚠️ 로그인 세션 복원 실패")
 
-        # 순차 처리
-        for idx in range(total_rows):
-            # 이미 처리된 항목은 건너뛰기
-            if idx in processed_indices:
-                print(f"[{idx+1}/{total_rows}] 건너뜀 (이미 처리됨)")
-                continue
-
-            row = df.iloc[idx]
-            kapt_name = row.get('kaptName', '')
-            doro_juso = row.get('doroJuso', '')
-            
+        # 순차 처리 (이미 처리된 항목은 pending 목록에서 제외됨)
+        pending_rows = get_pending_rows(processed_indices)
+        for idx, kapt_name, doro_juso, juso_valid in tqdm(pending_rows, desc="crawl", unit="apt"):
             print(f"\n[{idx+1}/{total_rows}] 크롤링 시작: {kapt_name}")
             
-            try:
-                # 리뷰 수집
-                reviews = crawl_zippoom(doro_juso, kapt_name, driver)
-                
-                # 각 리뷰에 source_index 추가
-                for review in reviews:
-                    review['source_index'] = idx
-                
-                # 리뷰가 없어도 처리 완료 기록
-                if not reviews:
-                    reviews = [{
-                        'kaptName': kapt_name,
-                        'doroJuso': doro_juso,
-                        'Score': None,
-                        'Pros': None,
-                        'Cons': None,
-                        'source_index': idx
-                    }]
-                
-                # CSV에 즉시 저장
-                append_to_csv(reviews, args.save)
-                print(f"  ✅ CSV에 저장 완료: {len(reviews)}건")
-                
-            except Exception as e:
-                print(f"  ⚠️ 에러 발생: {e}")
-                # 에러가 발생해도 처리 완료로 기록 (무한 루프 방지)
-                error_record = [{
-                    'kaptName': kapt_name,
-                    'doroJuso': doro_juso,
-                    'Score': None,
-                    'Pros': None,
-                    'Cons': None,
-                    'source_index': idx,
-                    'error': str(e)
-                }]
-                append_to_csv(error_record, args.save)
+            # 리뷰 수집 후 CSV에 즉시 저장
+            reviews = crawl_row(idx, kapt_name, doro_juso, juso_valid, driver)
+            appender.append_many(reviews)
+            processed_indices.add(idx)
+            print(f"  ✅ 저장 버퍼에 추가: {len(reviews)}건")
             
             # 다음 항목으로 넘어가기 전 대기
             time.sleep(1 + random.uniform(0, 0.3))
@@ -524,6 +1182,7 @@ def main():
             except Exception:
                 pass
 
+    appender.close()
     print(f"\n✅ 크롤링 완료! 결과는 '{args.save}'에 저장되었습니다.")
 
 
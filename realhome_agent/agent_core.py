@@ -9,8 +9,13 @@ Version: 2.0.0 (langgraph 호환)
 """
 
 import os
+import re
+import json
 import logging
-from typing import Optional, List, Dict, Any, Sequence
+import threading
+from collections import Counter, OrderedDict, deque
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Sequence, Iterator
 from datetime import datetime
 
 from langchain_openai import ChatOpenAI
@@ -18,6 +23,7 @@ from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, Base
 from langgraph.prebuilt import create_react_agent
 from langgraph.checkpoint.memory import MemorySaver
 
+from config import get_settings
 from custom_tools import get_all_tools, search_apartment_tool, policy_search_tool, loan_calculator_tool
 
 # 로깅 설정
@@ -32,10 +38,9 @@ logger = logging.getLogger(__name__)
 # 프롬프트 템플릿 정의
 # ============================================================================
 
-def get_system_prompt() -> str:
-    """시스템 프롬프트 생성"""
-    current_date = datetime.now().strftime("%Y년 %m월 %d일")
-    return f"""당신은 서울시 부동산 전문 AI 에이전트 "리얼홈 어시스턴트"입니다.
+# 날짜 등 가변 정보가 없는 정적 프롬프트: 모든 세션/턴에서 토큰 접두사가 동일하므로
+# OpenAI 자동 프롬프트 캐싱에 그대로 적중함 (날짜는 뒤에 별도 메시지로 붙임)
+SYSTEM_PROMPT = """당신은 서울시 부동산 전문 AI 에이전트 "리얼홈 어시스턴트"입니다.
 
 # 역할 및 목표
 당신은 마포구, 송파구, 노원구 지역 30년 이상의 전문 부동산 중개사입니다. 
@@ -83,8 +88,6 @@ def get_system_prompt() -> str:
 - 신혼: 문화생활, 쇼핑, 카페, 트렌디
 - 반려동물: 공원, 산책로, 반려동물 허용
 
-현재 날짜: {current_date}
-
 # 역할 및 목표
 당신은 마포구, 송파구, 노원구 지역 전문 부동산 추천 에이전트입니다. 
 엘라스틱 서치를 활용해 사용자의 조건에 맞는 매물을 찾고, 명확하고 투명한 정보를 제공합니다.
@@ -384,10 +387,64 @@ def get_system_prompt() -> str:
 """
 
 
+def _today_str() -> str:
+    return datetime.now().strftime("%Y년 %m월 %d일")
+
+
+STATIC_SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+
+
+@lru_cache(maxsize=2)
+def get_date_message_for(current_date: str) -> SystemMessage:
+    """날짜 안내 시스템 메시지 (같은 날에는 모든 세션이 같은 객체를 공유)"""
+    return SystemMessage(content=f"현재 날짜: {current_date}")
+
+
+def build_agent_prompt(state: Dict[str, Any]) -> List[BaseMessage]:
+    """
+    에이전트 입력 메시지 구성: [정적 프롬프트, 날짜 메시지, 대화 메시지...]
+    
+    매 호출 시 날짜를 다시 계산하므로 자정을 넘긴 세션도 올바른 날짜를 사용합니다.
+    """
+    return [STATIC_SYSTEM_MESSAGE, get_date_message_for(_today_str()), *state["messages"]]
+
+
+def get_system_prompt() -> str:
+    """시스템 프롬프트 생성 (정적 프롬프트 + 현재 날짜, 표시/디버깅용)"""
+    return f"{SYSTEM_PROMPT}\n{get_date_message_for(_today_str()).content}"
+
+
 # ============================================================================
 # 쿼리 파서 (모호한 질문 → 구체적 검색 조건)
 # ============================================================================
 
+def _build_keyword_matcher(*categories):
+    """
+    카테고리별 키워드 사전을 하나의 정규식으로 컴파일
+    
+    Args:
+        categories: (카테고리명, {키워드: 값}) 튜플들
+        
+    Returns:
+        (컴파일된 정규식, {키워드: [(카테고리명, 사전 내 순서, 값), ...]})
+    """
+    own: Dict[str, List[tuple]] = {}
+    for kind, mapping in categories:
+        for order, (keyword, value) in enumerate(mapping.items()):
+            # 리스트 값은 튜플로 고정해 파싱 결과가 클래스 사전을 공유/변경하지 않도록 함
+            if isinstance(value, list):
+                value = tuple(value)
+            own.setdefault(keyword, []).append((kind, order, value))
+    # 한 위치에서는 가장 긴 키워드만 매칭되므로, 그 키워드의 접두사인 키워드("잠실본동" → "잠실")도 함께 반환
+    info = {
+        keyword: [entry for prefix in own if keyword.startswith(prefix) for entry in own[prefix]]
+        for keyword in own
+    }
+    # 전방탐색으로 모든 시작 위치를 검사 ("8억대흥동"처럼 키워드가 겹쳐도 누락 없음)
+    alternation = "|".join(re.escape(k) for k in sorted(own, key=len, reverse=True))
+    return re.compile(f"(?=({alternation}))"), info
+
+
 class QueryParser:
     """
     사용자의 자연어 질문을 구체적인 검색 조건으로 변환합니다.
@@ -424,6 +481,12 @@ class QueryParser:
         "50평대": (165, 194.7),
     }
     
+    # 가격 범위 수식어 ("7억 이하" → 최대 가격만, "5억 이상" → 최소 가격만)
+    PRICE_MODIFIERS = {
+        "이하": "max",
+        "이상": "min",
+    }
+    
     # 라이프스타일 키워드 매핑
     LIFESTYLE_MAPPINGS = {
         "아이": ["육아", "교육", "안전", "학군"],
@@ -528,6 +591,29 @@ class QueryParser:
         "상계": ["노원구"],
     }
     
+    # "7 억대", "30 평대"처럼 숫자와 단위 사이에 띄어쓴 표현을 사전 키 형태로 붙이기 위한 정규식
+    # ("6억 대흥동"처럼 단위 뒤 공백은 지명일 수 있으므로 건드리지 않음)
+    _UNIT_SPACING_RE = re.compile(r"(?<=\d)\s+(?=[억평])")
+    
+    # 위 사전 전체를 쿼리 1회 스캔으로 찾기 위한 정규식 (키워드마다 `in` 검사를 반복하지 않음)
+    _KEYWORD_RE, _KEYWORD_INFO = _build_keyword_matcher(
+        ("price", PRICE_PATTERNS),
+        ("area", AREA_PATTERNS),
+        ("district", DISTRICT_MAPPINGS),
+        ("lifestyle", LIFESTYLE_MAPPINGS),
+        ("modifier", PRICE_MODIFIERS),
+    )
+    
+    @staticmethod
+    def _merge_price(price_range: tuple, modifiers: set) -> tuple:
+        """매칭된 가격 범위에 이하/이상 수식어 적용 → (min_price, max_price)"""
+        min_p, max_p = price_range
+        if "max" in modifiers:
+            return None, max_p
+        if "min" in modifiers:
+            return min_p, None
+        return min_p, max_p
+    
     @classmethod
     def parse(cls, query: str) -> Dict[str, Any]:
         """
@@ -539,58 +625,122 @@ class QueryParser:
         Returns:
             파싱된 검색 조건 딕셔너리
         """
-        result = {
-            "districts": None,
-            "min_price": None,
-            "max_price": None,
-            "min_area": None,
-            "max_area": None,
-            "lifestyle_keywords": [],
+        districts, min_price, max_price, min_area, max_area, lifestyle_keywords = cls._parse_cached(query)
+        
+        # 캐시된 튜플에서 매번 새 딕셔너리/리스트를 만들어 반환 (호출자가 수정해도 캐시는 안전)
+        return {
+            "districts": list(districts) if districts else None,
+            "min_price": min_price,
+            "max_price": max_price,
+            "min_area": min_area,
+            "max_area": max_area,
+            "lifestyle_keywords": list(lifestyle_keywords) if lifestyle_keywords else None,
             "natural_query": query
         }
+    
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _parse_cached(cls, query: str) -> tuple:
+        """
+        parse 본체 (같은 질문은 다시 스캔하지 않도록 불변 튜플로 메모이즈)
+        
+        Returns:
+            (districts, min_price, max_price, min_area, max_area, lifestyle_keywords)
+        """
+        # 숫자·단위 사이 공백만 정규화한 1개 표현을 모든 키워드 스캔에 공용으로 사용
+        # (키워드가 모두 한글/숫자라 lower()는 결과에 영향이 없으므로 대소문자 변환은 생략)
+        normalized = cls._UNIT_SPACING_RE.sub("", query)
         
-        query_lower = query.lower()
+        # 모든 키워드를 한 번에 스캔한 뒤 카테고리별로 분배
+        # (가격/면적/지역은 기존과 같이 사전 순서상 가장 앞선 키워드 하나만 사용)
+        best: Dict[str, tuple] = {}
+        keywords = set()
+        modifiers = set()
+        for match in cls._KEYWORD_RE.finditer(normalized):
+            for kind, order, value in cls._KEYWORD_INFO[match.group(1)]:
+                if kind == "lifestyle":
+                    keywords.update(value)
+                elif kind == "modifier":
+                    modifiers.add(value)
+                elif kind not in best or order < best[kind][0]:
+                    best[kind] = (order, value)
         
         # 가격 추출
-        for pattern, (min_p, max_p) in cls.PRICE_PATTERNS.items():
-            if pattern in query:
-                if "이하" in query:
-                    result["max_price"] = max_p
-                elif "이상" in query:
-                    result["min_price"] = min_p
-                else:
-                    result["min_price"] = min_p
-                    result["max_price"] = max_p
-                break
+        min_price = max_price = None
+        if "price" in best:
+            min_price, max_price = cls._merge_price(best["price"][1], modifiers)
         
         # 면적 추출
-        for pattern, (min_a, max_a) in cls.AREA_PATTERNS.items():
-            if pattern in query:
-                result["min_area"] = min_a
-                result["max_area"] = max_a
-                break
+        min_area = max_area = None
+        if "area" in best:
+            min_area, max_area = best["area"][1]
         
         # 지역 추출
-        for keyword, districts in cls.DISTRICT_MAPPINGS.items():
-            if keyword in query_lower:
-                result["districts"] = districts
-                break
+        districts = best["district"][1] if "district" in best else None
         
         # 라이프스타일 키워드 추출
-        keywords = set()
-        for trigger, mapped_keywords in cls.LIFESTYLE_MAPPINGS.items():
-            if trigger in query_lower:
-                keywords.update(mapped_keywords)
-        result["lifestyle_keywords"] = list(keywords) if keywords else None
+        lifestyle_keywords = tuple(sorted(keywords)) if keywords else None
         
-        logger.info(f"쿼리 파싱 결과: {result}")
-        return result
+        parsed = (districts, min_price, max_price, min_area, max_area, lifestyle_keywords)
+        logger.info("쿼리 파싱 결과 (캐시 미스): %s", parsed)
+        return parsed
 
 
 # ============================================================================
 # 리얼홈 에이전트 클래스
 # ============================================================================
 
+@lru_cache(maxsize=8)
+def get_shared_llm(model_name: str, temperature: float) -> ChatOpenAI:
+    """
+    (모델명, temperature)별 프로세스 공용 LLM 클라이언트
+    
+    ChatOpenAI는 대화 상태를 갖지 않으므로 모든 에이전트/세션이 하나의
+    HTTP 커넥션 풀을 공유합니다. (대화 기록은 세션별 MemorySaver가 관리)
+    """
+    return ChatOpenAI(
+        model=model_name,
+        temperature=temperature,
+        api_key=get_settings().openai_api_key
+    )
+
+
+@lru_cache(maxsize=1)
+def get_shared_tools() -> tuple:
+    """프로세스 공용 도구 목록"""
+    return tuple(get_all_tools())
+
+
+# 추천 질문 (정적 상수라 호출마다 리스트를 만들지 않도록 미리 잘라 둔 튜플을 반환)
+_DEFAULT_QUESTIONS = (
+    "7억대 송파구 30평대 아파트 추천해줘",
+    "아이 키우기 좋은 노원구 아파트 어디가 좋아?",
+    "출퇴근 편한 마포구 역세권 아파트 찾아줘",
+    "생애최초로 집 사려는데 대출 얼마나 받을 수 있어?",
+    "2025년 부동산 규제가 어떻게 바뀌었어?",
+    "연봉 8천만원인데 7억 아파트 살 수 있어?",
+)
+_FOLLOW_UP_QUESTIONS = (
+    "다른 지역도 검색해줘",
+    "더 저렴한 매물은 없어?",
+    "이 아파트 주변 시설은 어때?",
+    "대출 조건 더 자세히 알려줘",
+    "비슷한 조건의 다른 아파트 추천해줘",
+)
+_DEFAULT_QUESTIONS_TOP = _DEFAULT_QUESTIONS[:4]
+_FOLLOW_UP_QUESTIONS_TOP = _FOLLOW_UP_QUESTIONS[:3]
+
+# 인사말만 있는 입력 (LLM 호출 없이 고정 응답)
+_GREETING_RE = re.compile(
+    r"^\s*(?:안녕(?:하세요|하십니까)?|반가워요?|반갑습니다|하이|hi|hello)\s*[!.~?ㅎ]*\s*$",
+    re.IGNORECASE
+)
+_GREETING_REPLY = (
+    "안녕하세요! 리얼홈 어시스턴트입니다. 🏠\n"
+    "원하시는 지역, 예산, 평수나 생활 조건(육아, 교통 등)을 알려주시면 "
+    "맞춤 아파트를 찾아드릴게요."
+)
+
 class RealHomeAgent:
     """
     라이프스타일 기반 리얼홈 에이전트
@@ -604,7 +754,9 @@ class RealHomeAgent:
         model_name: str = None,
         temperature: float = None,
         max_memory_tokens: int = 2000,
-        verbose: bool = True
+        verbose: bool = True,
+        llm: Optional[ChatOpenAI] = None,
+        tools: Optional[Sequence] = None
     ):
         """
         에이전트 초기화
@@ -614,38 +766,42 @@ class RealHomeAgent:
             temperature: 응답 창의성 (0~1, 기본값: 환경변수 OPENAI_TEMPERATURE 또는 0.3)
             max_memory_tokens: 메모리 최대 토큰 수
             verbose: 상세 로깅 여부
+            llm: 사용할 LLM 클라이언트 (없으면 get_shared_llm())
+            tools: 사용할 도구 리스트 (없으면 get_shared_tools())
         """
-        # 환경변수에서 설정 읽기
-        self.model_name = model_name or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        self.temperature = temperature if temperature is not None else float(os.getenv("OPENAI_TEMPERATURE", "0.3"))
+        # 환경변수에서 설정 읽기 (프로세스 시작 시 1회 읽은 설정 사용)
+        settings = get_settings()
+        self.model_name = model_name or settings.openai_model or "gpt-4o-mini"
+        self.temperature = temperature if temperature is not None else settings.openai_temperature
         self.verbose = verbose
         
-        # LLM 초기화
-        self.llm = ChatOpenAI(
-            model=self.model_name,
-            temperature=self.temperature,
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
+        # LLM 초기화 (지정하지 않으면 프로세스 공용 클라이언트 재사용)
+        self.llm = llm if llm is not None else get_shared_llm(self.model_name, self.temperature)
         
         # 도구 초기화
-        self.tools = get_all_tools()
+        self.tools = list(tools if tools is not None else get_shared_tools())
         
         # 대화 기록 저장 (langgraph용 MemorySaver)
         self.memory = MemorySaver()
         
-        # 대화 기록 (내부 관리용)
-        self._chat_history: List[BaseMessage] = []
+        # 대화 기록 (UI 표시용, 세션이 길어져도 메모리가 늘지 않도록 최근 메시지만 유지)
+        # 실제 대화 맥락은 MemorySaver가 보관하므로 메시지당 약 32토큰 기준으로 개수만 제한
+        # get_chat_history가 매번 변환하지 않도록 {"role", "content"} 딕셔너리 형태로 저장
+        self._chat_history: deque = deque(maxlen=max(2, max_memory_tokens // 32))
         
         # 쿼리 파서
         self.query_parser = QueryParser()
         
-        # 시스템 프롬프트
+        # 응답 경로별 처리 횟수 (greeting / direct_search / agent)
+        self.route_counts: Counter = Counter()
+        
+        # 시스템 프롬프트 (실제 에이전트 입력은 build_agent_prompt가 구성)
         self.system_prompt = get_system_prompt()
         
         # 에이전트 초기화
         self._init_agent()
         
-        logger.info(f"RealHomeAgent 초기화 완료 (model: {self.model_name})")
+        logger.info("RealHomeAgent 초기화 완료 (model: %s)", self.model_name)
     
     def _init_agent(self) -> None:
         """LangGraph ReAct 에이전트 초기화"""
@@ -654,35 +810,43 @@ class RealHomeAgent:
         self.agent = create_react_agent(
             model=self.llm,
             tools=self.tools,
-            prompt=SystemMessage(content=self.system_prompt),
+            prompt=build_agent_prompt,
             checkpointer=self.memory
         )
         
         logger.info("LangGraph ReAct 에이전트 초기화 완료")
     
-    def chat(self, user_message: str, thread_id: str = "default") -> str:
+    def chat(self, user_message: str, thread_id: str = "default", direct_search: bool = False) -> str:
         """
         사용자 메시지 처리 및 응답 생성
         
         Args:
             user_message: 사용자 입력
             thread_id: 대화 스레드 ID
+            direct_search: 필터 검색처럼 조건이 확정된 요청이면 정보 확인 단계 없이 바로 검색
             
         Returns:
             에이전트 응답
         """
         try:
-            logger.info(f"사용자 입력: {user_message}")
+            logger.info("사용자 입력: %s", user_message)
             
             # 쿼리 파싱 (모호한 질문 구체화)
             parsed_query = self.query_parser.parse(user_message)
             
             # 대화 기록에 사용자 메시지 추가
-            self._chat_history.append(HumanMessage(content=user_message))
+            self._chat_history.append({"role": "user", "content": user_message})
             
-            # 에이전트 실행 (langgraph는 invoke 사용)
             config = {"configurable": {"thread_id": thread_id}}
             
+            # 인사말/조건이 확정된 필터 검색은 LLM 호출 없이 바로 응답
+            output = self._fast_reply(user_message, parsed_query, config, direct_search)
+            if output is not None:
+                self._chat_history.append({"role": "assistant", "content": output})
+                return output
+            
+            # 에이전트 실행 (langgraph는 invoke 사용)
+            self.route_counts["agent"] += 1
             response = self.agent.invoke(
                 {"messages": [HumanMessage(content=user_message)]},
                 config=config
@@ -691,28 +855,186 @@ class RealHomeAgent:
             # 응답 추출
             messages = response.get("messages", [])
             if messages:
-                # 마지막 AI 메시지 추출
-                output = ""
-                for msg in reversed(messages):
-                    if isinstance(msg, AIMessage) and msg.content:
-                        output = msg.content
-                        break
-                
-                if not output:
-                    output = str(messages[-1].content) if messages else "죄송합니다. 응답을 생성하지 못했습니다."
+                # 마지막 AI 메시지 추출 (ReAct 에이전트는 보통 마지막 메시지가 최종 답변이므로 먼저 확인)
+                last = messages[-1]
+                if isinstance(last, AIMessage) and last.content:
+                    output = last.content
+                else:
+                    output = next(
+                        (msg.content for msg in reversed(messages) if isinstance(msg, AIMessage) and msg.content),
+                        ""
+                    ) or str(last.content)
             else:
                 output = "죄송합니다. 응답을 생성하지 못했습니다."
             
             # 대화 기록에 AI 응답 추가
-            self._chat_history.append(AIMessage(content=output))
+            self._chat_history.append({"role": "assistant", "content": output})
             
-            logger.info(f"에이전트 응답: {output[:200]}..." if len(output) > 200 else f"에이전트 응답: {output}")
+            logger.info("에이전트 응답: %.200s%s", output, "..." if len(output) > 200 else "")
             return output
             
         except Exception as e:
-            logger.error(f"채팅 처리 오류: {e}")
+            logger.error("채팅 처리 오류: %s", e)
             return f"죄송합니다. 오류가 발생했습니다: {str(e)}\n다시 시도해 주세요."
     
+    def chat_stream(
+        self,
+        user_message: str,
+        thread_id: str = "default",
+        direct_search: bool = False
+    ) -> Iterator[str]:
+        """
+        사용자 메시지 처리 및 응답 스트리밍
+        
+        ReAct 루프 전체가 끝날 때까지 기다리지 않고, 에이전트의 최종 답변 토큰을
+        생성되는 대로 반환합니다. (도구 호출 메시지는 제외)
+        
+        Args:
+            user_message: 사용자 입력
+            thread_id: 대화 스레드 ID
+            direct_search: 필터 검색처럼 조건이 확정된 요청이면 정보 확인 단계 없이 바로 검색
+            
+        Yields:
+            에이전트 응답 텍스트 조각
+        """
+        logger.info("사용자 입력: %s", user_message)
+        
+        # 쿼리 파싱 (모호한 질문 구체화)
+        parsed_query = self.query_parser.parse(user_message)
+        
+        # 대화 기록에 사용자 메시지 추가
+        self._chat_history.append({"role": "user", "content": user_message})
+        
+        config = {"configurable": {"thread_id": thread_id}}
+        parts: List[str] = []
+        
+        # 인사말/조건이 확정된 필터 검색은 LLM 호출 없이 바로 응답
+        try:
+            output = self._fast_reply(user_message, parsed_query, config, direct_search)
+        except Exception as e:
+            logger.error("빠른 응답 처리 오류: %s", e)
+            output = None
+        if output is not None:
+            self._chat_history.append({"role": "assistant", "content": output})
+            yield output
+            return
+        
+        self.route_counts["agent"] += 1
+        try:
+            for chunk, metadata in self.agent.stream(
+                {"messages": [HumanMessage(content=user_message)]},
+                config=config,
+                stream_mode="messages"
+            ):
+                if (
+                    isinstance(chunk, AIMessage)
+                    and isinstance(chunk.content, str)
+                    and chunk.content
+                    and not getattr(chunk, "tool_call_chunks", None)
+                    and metadata.get("langgraph_node") == "agent"
+                ):
+                    parts.append(chunk.content)
+                    yield chunk.content
+        except Exception as e:
+            logger.error("채팅 처리 오류: %s", e)
+            error_message = f"죄송합니다. 오류가 발생했습니다: {str(e)}\n다시 시도해 주세요."
+            parts.append(error_message)
+            yield error_message
+        
+        if not parts:
+            parts.append("죄송합니다. 응답을 생성하지 못했습니다.")
+            yield parts[0]
+        
+        # 대화 기록에 AI 응답 추가
+        output = "".join(parts)
+        self._chat_history.append({"role": "assistant", "content": output})
+        logger.info("에이전트 응답: %.200s%s", output, "..." if len(output) > 200 else "")
+    
+    def _fast_reply(
+        self,
+        user_message: str,
+        parsed_query: Dict[str, Any],
+        config: Dict,
+        direct_search: bool = False
+    ) -> Optional[str]:
+        """
+        LLM 호출 없이 처리 가능한 입력에 대한 응답
+        
+        - 인사말만 있는 입력: 고정 안내 문구
+        - direct_search 요청(사이드바 필터 검색) 중 지역/최대 가격/최대 면적이 모두 파싱되고
+          라이프스타일 조건이 없는 검색: 아파트 검색 도구를 바로 호출
+          (결과가 없으면 에이전트가 조건 완화를 안내하도록 넘김)
+        
+        채팅으로 입력한 매물 요청은 문구와 관계없이 에이전트가 STEP 1(정보 확인)부터 진행하도록
+        바로 검색하지 않습니다.
+        
+        응답한 턴은 이후 대화 맥락이 이어지도록 에이전트 메모리에도 기록합니다.
+        
+        Returns:
+            응답 문자열 (에이전트로 넘겨야 하면 None)
+        """
+        if _GREETING_RE.match(user_message):
+            route, output = "greeting", _GREETING_REPLY
+        elif (
+            direct_search
+            and parsed_query["districts"]
+            and parsed_query["max_price"] is not None
+            and parsed_query["max_area"] is not None
+            and not parsed_query["lifestyle_keywords"]
+        ):
+            output = self._direct_search(parsed_query)
+            if output is None:
+                return None
+            route = "direct_search"
+        else:
+            return None
+        
+        self.route_counts[route] += 1
+        logger.info("빠른 응답 경로: %s", route)
+        
+        try:
+            self.agent.update_state(
+                config,
+                {"messages": [HumanMessage(content=user_message), AIMessage(content=output)]},
+                as_node="agent"
+            )
+        except Exception as e:
+            logger.warning("빠른 응답 메모리 기록 실패: %s", e)
+        return output
+    
+    def _direct_search(self, parsed_query: Dict[str, Any]) -> Optional[str]:
+        """파싱된 조건으로 아파트 검색 도구를 직접 호출하고 결과를 요약"""
+        search_tool = next((t for t in self.tools if t.name == search_apartment_tool.name), None)
+        if search_tool is None:
+            return None
+        
+        result = json.loads(search_tool.invoke({
+            "districts": parsed_query["districts"],
+            "min_price": parsed_query["min_price"],
+            "max_price": parsed_query["max_price"],
+            "min_area": parsed_query["min_area"],
+            "max_area": parsed_query["max_area"],
+        }))
+        apartments = result.get("apartments") or []
+        if result.get("status") != "success" or not apartments:
+            return None
+        
+        conditions = result.get("search_conditions", {})
+        lines = [
+            f"요청하신 조건({', '.join(conditions.get('지역', []))}, "
+            f"{conditions.get('가격범위', '')}, {conditions.get('면적범위', '')})에 맞는 "
+            f"아파트 {len(apartments)}곳입니다.",
+            ""
+        ]
+        for apt in apartments:
+            lines.append(
+                f"{apt['순위']}. **{apt['아파트명']}** ({apt['구']}) - "
+                f"{apt['가격']}, {apt['면적']}, {apt['준공년도']}년 준공, 리뷰 {apt['리뷰점수']}"
+            )
+        lines.append("")
+        lines.append("원하시는 생활 조건(육아, 교통 등)이 있으면 알려주세요. 더 맞춤으로 찾아드릴게요.")
+        return "\n".join(lines)
+    
     def get_chat_history(self) -> List[Dict[str, str]]:
         """
         대화 기록 반환
@@ -720,15 +1042,7 @@ class RealHomeAgent:
         Returns:
             대화 기록 리스트
         """
-        history = []
-        
-        for msg in self._chat_history:
-            if isinstance(msg, HumanMessage):
-                history.append({"role": "user", "content": msg.content})
-            elif isinstance(msg, AIMessage):
-                history.append({"role": "assistant", "content": msg.content})
-        
-        return history
+        return list(self._chat_history)
     
     def clear_memory(self) -> None:
         """대화 기록 초기화"""
@@ -738,7 +1052,7 @@ class RealHomeAgent:
         self._init_agent()
         logger.info("대화 기록 초기화 완료")
     
-    def get_suggested_questions(self, context: str = "") -> List[str]:
+    def get_suggested_questions(self, context: str = "") -> Sequence[str]:
         """
         컨텍스트 기반 추천 질문 생성
         
@@ -746,29 +1060,13 @@ class RealHomeAgent:
             context: 현재 대화 컨텍스트
             
         Returns:
-            추천 질문 리스트
+            추천 질문 튜플 (공용 상수이므로 수정하지 말 것)
         """
-        default_questions = [
-            "7억대 송파구 30평대 아파트 추천해줘",
-            "아이 키우기 좋은 노원구 아파트 어디가 좋아?",
-            "출퇴근 편한 마포구 역세권 아파트 찾아줘",
-            "생애최초로 집 사려는데 대출 얼마나 받을 수 있어?",
-            "2025년 부동산 규제가 어떻게 바뀌었어?",
-            "연봉 8천만원인데 7억 아파트 살 수 있어?",
-        ]
-        
         # 대화 기록이 있으면 후속 질문 추천
         if self._chat_history:
-            follow_up_questions = [
-                "다른 지역도 검색해줘",
-                "더 저렴한 매물은 없어?",
-                "이 아파트 주변 시설은 어때?",
-                "대출 조건 더 자세히 알려줘",
-                "비슷한 조건의 다른 아파트 추천해줘",
-            ]
-            return follow_up_questions[:3]
+            return _FOLLOW_UP_QUESTIONS_TOP
         
-        return default_questions[:4]
+        return _DEFAULT_QUESTIONS_TOP
 
 
 # ============================================================================
@@ -780,10 +1078,17 @@ class SessionManager:
     멀티 세션 관리자
     
     여러 사용자의 대화 세션을 관리합니다.
+    LLM 클라이언트(HTTP 커넥션 풀)와 도구 리스트는 get_shared_llm/get_shared_tools로
+    세션 간에 공유하고, 대화 기록(MemorySaver)만 세션별로 분리합니다.
+    세션 수는 max_sessions(기본값: AGENT_SESSION_CACHE 환경변수 또는 64)로 제한하며,
+    초과 시 가장 오래 사용되지 않은 세션부터 제거합니다 (LRU).
     """
     
-    def __init__(self):
-        self._sessions: Dict[str, RealHomeAgent] = {}
+    def __init__(self, max_sessions: Optional[int] = None):
+        self.max_sessions = max_sessions or get_settings().agent_session_cache
+        self._sessions: "OrderedDict[str, RealHomeAgent]" = OrderedDict()
+        # Streamlit 등 멀티스레드 환경에서 같은 세션을 중복 생성하지 않도록 보호
+        self._lock = threading.RLock()
     
     def get_or_create_session(
         self,
@@ -800,22 +1105,35 @@ class SessionManager:
         Returns:
             RealHomeAgent 인스턴스
         """
-        if session_id not in self._sessions:
-            self._sessions[session_id] = RealHomeAgent(**agent_kwargs)
-            logger.info(f"새 세션 생성: {session_id}")
-        return self._sessions[session_id]
+        with self._lock:
+            agent = self._sessions.get(session_id)
+            if agent is not None:
+                self._sessions.move_to_end(session_id)
+                return agent
+            
+            agent = RealHomeAgent(**agent_kwargs)
+            self._sessions[session_id] = agent
+            logger.info("새 세션 생성: %s", session_id)
+            
+            # 최대 세션 수 초과 시 가장 오래 사용되지 않은 세션 제거
+            while len(self._sessions) > self.max_sessions:
+                evicted_id, _ = self._sessions.popitem(last=False)
+                logger.info("세션 제거 (LRU): %s", evicted_id)
+            return agent
     
     def delete_session(self, session_id: str) -> bool:
         """세션 삭제"""
-        if session_id in self._sessions:
-            del self._sessions[session_id]
-            logger.info(f"세션 삭제: {session_id}")
-            return True
-        return False
+        with self._lock:
+            if session_id in self._sessions:
+                del self._sessions[session_id]
+                logger.info("세션 삭제: %s", session_id)
+                return True
+            return False
     
     def clear_all_sessions(self) -> None:
         """모든 세션 삭제"""
-        self._sessions.clear()
+        with self._lock:
+            self._sessions.clear()
         logger.info("모든 세션 삭제 완료")
 
 
@@ -9,10 +9,11 @@ Version: 1.0.0
 
 import os
 import sys
+import html
 import uuid
 import logging
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, TYPE_CHECKING
 
 import streamlit as st
 from streamlit_chat import message
@@ -20,8 +21,13 @@ from streamlit_chat import message
 # 모듈 경로 추가
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from agent_core import RealHomeAgent, session_manager
-from models import SearchQuery
+from config import get_settings
+
+# agent_core/search_engine은 LangGraph·torch 등을 끌어오므로 실제로 필요할 때 import
+# (첫 화면 표시가 무거운 import를 기다리지 않도록 함)
+if TYPE_CHECKING:
+    from agent_core import RealHomeAgent
+    from search_engine import SearchEngine
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -39,8 +45,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# ============================================================================
+# 정적 마크업 (모듈 상수로 한 번만 생성)
+# ============================================================================
+# Streamlit은 rerun 때 다시 그리지 않은 요소를 화면에서 지우므로,
+# CSS/헤더/푸터도 매 rerun 출력해야 함 (문자열 생성만 모듈 로드 시 1회)
+
 # 커스텀 CSS
-st.markdown("""
+_CSS = """
 <style>
     /* 전체 스타일 */
     .main-header {
@@ -127,7 +139,59 @@ st.markdown("""
         padding: 20px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+_HEADER_HTML = (
+    '<h1 class="main-header">🏠 리얼홈 에이전트</h1>'
+    '<p class="sub-header">서울시 송파구, 마포구, 노원구의 맞춤형 아파트를 추천해드립니다</p>'
+)
+
+_WELCOME_MD = """
+    ### 👋 안녕하세요! 리얼홈 에이전트입니다.
+    
+    서울시 **송파구, 마포구, 노원구** 지역의 아파트 매물을 추천해드립니다.
+    
+    #### 🎯 이런 것들을 도와드릴 수 있어요:
+    
+    | 기능 | 예시 질문 |
+    |------|----------|
+    | 🏢 **매물 검색** | "송파구 30평대 아파트 추천해줘" |
+    | 👶 **라이프스타일 매칭** | "아이 키우기 좋은 조용한 동네 찾아줘" |
+    | 💰 **대출 계산** | "연봉 8천만원인데 대출 얼마나 받을 수 있어?" |
+    | 📋 **정책 안내** | "2025년 LTV 규제가 어떻게 되나요?" |
+    
+    ---
+    
+    **💡 Tip**: 왼쪽 사이드바에서 필터를 설정하면 더 정확한 검색이 가능해요!
+    """
+
+_API_KEY_WARNING_MD = """
+        ⚠️ **OPENAI_API_KEY가 설정되지 않았습니다.**
+        
+        에이전트 기능을 사용하려면 환경변수를 설정해주세요:
+        ```bash
+        export OPENAI_API_KEY="your-api-key"
+        ```
+        
+        또는 `.env` 파일에 추가해주세요.
+        """
+
+_FOOTER_HTML = (
+    "<p style='text-align: center; color: #888;'>"
+    "🏠 리얼홈 에이전트 | 서울시 아파트 맞춤 추천 서비스 | "
+    "© 2025 RealHome Agent Team"
+    "</p>"
+)
+
+# 사이드바 추천 질문 (선택박스 첫 항목은 미선택 표시용 빈 문자열)
+_SUGGESTED = (
+    "송파구 30평대 아파트 추천해줘",
+    "아이 키우기 좋은 노원구 아파트",
+    "역세권 마포구 신축 아파트",
+    "대출 가능 금액 계산해줘",
+    "2025년 부동산 정책 알려줘",
+)
+_SUGGESTED_OPTIONS = ("",) + _SUGGESTED
 
 
 # ============================================================================
@@ -165,12 +229,14 @@ def init_session_state():
         st.session_state.is_loading = False
 
 
-def get_agent() -> RealHomeAgent:
+def get_agent() -> "RealHomeAgent":
     """에이전트 인스턴스 반환"""
     if st.session_state.agent is None:
         try:
+            from agent_core import RealHomeAgent
+            
             st.session_state.agent = RealHomeAgent(
-                model_name=os.getenv("OPENAI_MODEL", "gpt-5-mini-2025-08-07"),
+                model_name=get_settings().openai_model or "gpt-5-mini-2025-08-07",
                 temperature=0.3,
                 verbose=False
             )
@@ -261,20 +327,17 @@ def render_sidebar():
         
         st.markdown("---")
         
-        # 추천 질문
+        # 추천 질문 (버튼 N개 대신 선택박스 1개)
         st.markdown("#### 💡 추천 질문")
         
-        suggested_questions = [
-            "송파구 30평대 아파트 추천해줘",
-            "아이 키우기 좋은 노원구 아파트",
-            "역세권 마포구 신축 아파트",
-            "대출 가능 금액 계산해줘",
-            "2025년 부동산 정책 알려줘"
-        ]
-        
-        for question in suggested_questions:
-            if st.button(f"💬 {question}", key=f"q_{question}", use_container_width=True):
-                process_user_input(question)
+        st.selectbox(
+            "추천 질문",
+            options=_SUGGESTED_OPTIONS,
+            format_func=lambda q: f"💬 {q}" if q else "질문을 선택하세요",
+            key="suggested_question",
+            on_change=_on_suggested_question,
+            label_visibility="collapsed"
+        )
         
         st.markdown("---")
         
@@ -285,13 +348,22 @@ def render_sidebar():
             clear_chat()
         
         # API 키 상태
-        api_key_status = "✅ 설정됨" if os.getenv("OPENAI_API_KEY") else "❌ 미설정"
+        api_key_status = "✅ 설정됨" if get_settings().openai_api_key else "❌ 미설정"
         st.markdown(f"**OpenAI API**: {api_key_status}")
         
         es_status = "✅ 연결됨" if check_elasticsearch() else "⚠️ 미연결"
         st.markdown(f"**ElasticSearch**: {es_status}")
 
 
+def _on_suggested_question():
+    """
+    추천 질문 선택 콜백: 채팅 영역에서 처리하도록 질문을 넘기고 선택박스를 초기 상태로 되돌림
+    (한 번만 꺼내 처리하므로 rerun 시 같은 질문이 다시 실행되지 않음)
+    """
+    st.session_state._pending_input = st.session_state.suggested_question
+    st.session_state.suggested_question = ""
+
+
 def apply_filter_search():
     """필터 기반 검색 실행"""
     filters = st.session_state.filters
@@ -314,25 +386,42 @@ def apply_filter_search():
     
     if query_parts:
         search_query = f"{'의 '.join(query_parts)} 아파트 추천해줘"
-        process_user_input(search_query)
+        # 사이드바 안이 아닌 채팅 영역에서 같은 실행 중에 처리 (조건이 확정된 검색이므로 바로 검색)
+        st.session_state._pending_input = search_query
+        st.session_state._pending_direct_search = True
     else:
         st.warning("최소 하나의 필터 조건을 선택해주세요.")
 
 
-def check_elasticsearch() -> bool:
-    """ElasticSearch 연결 상태 확인"""
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _get_status_engine(host: str, port: int) -> "SearchEngine":
+    """
+    상태 확인용 검색 엔진 (접속 정보별로 프로세스당 1회 생성·연결)
+    
+    접속 정보가 바뀌면 _get_status_engine.clear()로 다시 만들 수 있습니다.
+    """
+    from search_engine import SearchEngine, ESConfig
+    
+    engine = SearchEngine(ESConfig(host=host, port=port))
+    engine.connect(max_retries=1)  # 실패해도 클라이언트는 남아 이후 ping으로 재확인
+    return engine
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _es_status(host: str, port: int) -> bool:
+    """ElasticSearch 연결 여부 (30초간 캐시하여 rerun마다 네트워크 확인하지 않음)"""
     try:
-        from search_engine import SearchEngine, ESConfig
-        config = ESConfig(
-            host=os.getenv("ES_HOST", "localhost"),
-            port=int(os.getenv("ES_PORT", "9200"))
-        )
-        engine = SearchEngine(config)
-        return engine.connect()
-    except:
+        return _get_status_engine(host, port).is_connected()
+    except Exception:
         return False
 
 
+def check_elasticsearch() -> bool:
+    """ElasticSearch 연결 상태 확인"""
+    settings = get_settings()
+    return _es_status(settings.es_host, settings.es_port)
+
+
 # ============================================================================
 # 채팅 인터페이스
 # ============================================================================
@@ -341,15 +430,22 @@ def render_chat_interface():
     """채팅 인터페이스 렌더링"""
     
     # 헤더
-    st.markdown('<h1 class="main-header">🏠 리얼홈 에이전트</h1>', unsafe_allow_html=True)
-    st.markdown('<p class="sub-header">서울시 송파구, 마포구, 노원구의 맞춤형 아파트를 추천해드립니다</p>', unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     # 채팅 컨테이너
     chat_container = st.container()
     
     with chat_container:
-        # 대화 기록 표시
-        for i, msg in enumerate(st.session_state.messages):
+        # 대화 기록 표시: 최근 1턴만 chat_message 위젯으로, 이전 기록은 하나의 마크다운으로 렌더링
+        # (대화가 길어져도 rerun마다 비교할 위젯 수가 늘지 않음)
+        messages = st.session_state.messages
+        history, tail = messages[:-2], messages[-2:]
+        if history:
+            st.markdown(
+                "".join(_message_html(msg) for msg in history) + '<div style="clear: both;"></div>',
+                unsafe_allow_html=True
+            )
+        for msg in tail:
             if msg['role'] == 'user':
                 with st.chat_message("user", avatar="👤"):
                     st.markdown(msg['content'])
@@ -360,45 +456,49 @@ def render_chat_interface():
     # 입력 영역
     st.markdown("---")
     
-    # 환영 메시지 (첫 방문시)
+    # 환영 메시지 (첫 방문시, 입력이 들어오면 같은 실행 안에서 지움)
+    welcome = st.empty()
     if not st.session_state.messages:
-        render_welcome_message()
+        with welcome.container():
+            render_welcome_message()
     
-    # 사용자 입력
+    # 사용자 입력 (사이드바의 추천 질문/필터 검색도 여기서 처리)
     user_input = st.chat_input(
         "무엇이든 물어보세요! (예: 30평대 송파구 아파트 추천해줘)",
         key="user_input"
     )
+    direct_search = False
+    if not user_input:
+        user_input = st.session_state.pop("_pending_input", None)
+        direct_search = st.session_state.pop("_pending_direct_search", False)
     
     if user_input:
-        process_user_input(user_input)
+        welcome.empty()
+        # 새 메시지는 기존 대화 아래에 바로 그림 (전체 스크립트 rerun 없음)
+        with chat_container:
+            process_user_input(user_input, direct_search=direct_search)
+
+
+def _message_html(msg: Dict[str, Any]) -> str:
+    """
+    이전 대화 메시지 1건의 HTML (메시지에 캐시하여 rerun마다 다시 만들지 않음)
+    
+    빈 줄로 감싸 div 안의 내용도 마크다운으로 렌더링되며, 원문의 HTML은 이스케이프합니다.
+    """
+    if '_html' not in msg:
+        css_class = "user-message" if msg['role'] == 'user' else "assistant-message"
+        msg['_html'] = f'<div class="{css_class}">\n\n{html.escape(msg["content"], quote=False)}\n\n</div>\n\n'
+    return msg['_html']
 
 
 def render_welcome_message():
     """환영 메시지 렌더링"""
     
-    st.markdown("""
-    ### 👋 안녕하세요! 리얼홈 에이전트입니다.
-    
-    서울시 **송파구, 마포구, 노원구** 지역의 아파트 매물을 추천해드립니다.
-    
-    #### 🎯 이런 것들을 도와드릴 수 있어요:
-    
-    | 기능 | 예시 질문 |
-    |------|----------|
-    | 🏢 **매물 검색** | "송파구 30평대 아파트 추천해줘" |
-    | 👶 **라이프스타일 매칭** | "아이 키우기 좋은 조용한 동네 찾아줘" |
-    | 💰 **대출 계산** | "연봉 8천만원인데 대출 얼마나 받을 수 있어?" |
-    | 📋 **정책 안내** | "2025년 LTV 규제가 어떻게 되나요?" |
-    
-    ---
-    
-    **💡 Tip**: 왼쪽 사이드바에서 필터를 설정하면 더 정확한 검색이 가능해요!
-    """)
+    st.markdown(_WELCOME_MD)
 
 
-def process_user_input(user_input: str):
-    """사용자 입력 처리"""
+def process_user_input(user_input: str, direct_search: bool = False):
+    """사용자 입력 처리 (direct_search: 사이드바 필터 검색이면 정보 확인 없이 바로 검색)"""
     
     if not user_input.strip():
         return
@@ -410,27 +510,34 @@ def process_user_input(user_input: str):
         'timestamp': datetime.now().isoformat()
     })
     
-    # 에이전트 응답 생성
-    with st.spinner("🔍 검색 중..."):
+    with st.chat_message("user", avatar="👤"):
+        st.markdown(user_input)
+    
+    # 에이전트 응답 생성 (토큰이 생성되는 대로 화면에 표시)
+    with st.chat_message("assistant", avatar="🏠"):
+        placeholder = st.empty()
+        placeholder.markdown("🔍 검색 중...")
         try:
             agent = get_agent()
             if agent:
-                response = agent.chat(user_input)
+                parts = []
+                for token in agent.chat_stream(user_input, direct_search=direct_search):
+                    parts.append(token)
+                    placeholder.markdown("".join(parts) + "▌")
+                response = "".join(parts)
             else:
                 response = "죄송합니다. 에이전트 초기화에 실패했습니다. OPENAI_API_KEY가 설정되어 있는지 확인해주세요."
         except Exception as e:
             logger.error(f"응답 생성 오류: {e}")
             response = f"죄송합니다. 오류가 발생했습니다: {str(e)}"
+        placeholder.markdown(response)
     
-    # 어시스턴트 메시지 추가
+    # 어시스턴트 메시지 추가 (화면에는 이미 그렸으므로 rerun하지 않음)
     st.session_state.messages.append({
         'role': 'assistant',
         'content': response,
         'timestamp': datetime.now().isoformat()
     })
-    
-    # 페이지 새로고침
-    st.rerun()
 
 
 def clear_chat():
@@ -509,21 +616,15 @@ def render_loan_result(loan_info: Dict):
 def main():
     """메인 실행 함수"""
     
+    # 커스텀 CSS
+    st.markdown(_CSS, unsafe_allow_html=True)
+    
     # 세션 상태 초기화
     init_session_state()
     
     # 환경변수 확인
-    if not os.getenv("OPENAI_API_KEY"):
-        st.warning("""
-        ⚠️ **OPENAI_API_KEY가 설정되지 않았습니다.**
-        
-        에이전트 기능을 사용하려면 환경변수를 설정해주세요:
-        ```bash
-        export OPENAI_API_KEY="your-api-key"
-        ```
-        
-        또는 `.env` 파일에 추가해주세요.
-        """)
+    if not get_settings().openai_api_key:
+        st.warning(_API_KEY_WARNING_MD)
     
     # 사이드바 렌더링
     render_sidebar()
@@ -533,13 +634,7 @@ def main():
     
     # 푸터
     st.markdown("---")
-    st.markdown(
-        "<p style='text-align: center; color: #888;'>"
-        "🏠 리얼홈 에이전트 | 서울시 아파트 맞춤 추천 서비스 | "
-        "© 2025 RealHome Agent Team"
-        "</p>",
-        unsafe_allow_html=True
-    )
+    st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,58 @@
+"""
+환경 설정 모듈
+==============
+환경변수를 프로세스 시작 시 한 번만 읽어 불변 설정 객체로 제공
+
+Author: RealHome Agent Team
+Version: 1.0.0
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class Settings:
+    """애플리케이션 설정 (환경변수 스냅샷)"""
+    # OpenAI
+    openai_api_key: Optional[str] = None
+    openai_model: Optional[str] = None  # 미설정 시 사용처별 기본 모델 사용
+    openai_temperature: float = 0.3
+
+    # ElasticSearch
+    es_host: str = "localhost"
+    es_port: int = 9200
+    es_username: Optional[str] = None
+    es_password: Optional[str] = None
+    es_index: str = "realhome_apartments"
+    es_knn_candidates_factor: int = 2
+
+    # 세션 관리
+    agent_session_cache: int = 64
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    환경변수 기반 설정 반환 (최초 호출 시 1회 생성)
+
+    환경변수를 바꾼 뒤 다시 읽으려면 get_settings.cache_clear()를 호출합니다.
+
+    Returns:
+        Settings 인스턴스
+    """
+    env = os.environ
+    return Settings(
+        openai_api_key=env.get("OPENAI_API_KEY") or None,
+        openai_model=env.get("OPENAI_MODEL") or None,
+        openai_temperature=float(env.get("OPENAI_TEMPERATURE", "0.3")),
+        es_host=env.get("ES_HOST", "localhost"),
+        es_port=int(env.get("ES_PORT", "9200")),
+        es_username=env.get("ES_USERNAME"),
+        es_password=env.get("ES_PASSWORD"),
+        es_index=env.get("ES_INDEX", "realhome_apartments"),
+        es_knn_candidates_factor=int(env.get("ES_KNN_CANDIDATES_FACTOR", "2")),
+        agent_session_cache=int(env.get("AGENT_SESSION_CACHE", "64")),
+    )
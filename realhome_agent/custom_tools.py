@@ -10,13 +10,21 @@ Author: RealHome Agent Team
 Version: 1.0.0
 """
 
-import os
+import time
 import logging
-from typing import Optional, List, Dict, Any
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 import json
 import requests
 
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경은 표준 json 사용
+    orjson = None
+
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
@@ -26,6 +34,7 @@ from models import (
     LoanCalculationResult,
     PolicySearchResult
 )
+from config import get_settings
 from search_engine import SearchEngine, ESConfig
 
 # 로깅 설정
@@ -35,10 +44,51 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+def _dumps(obj: Any) -> str:
+    """
+    도구 결과 JSON 직렬화
+    
+    결과는 LLM 입력으로만 쓰이므로 들여쓰기 없이(토큰 절약) 직렬화하며,
+    orjson이 있으면 C 구현 인코더를 사용합니다. (UTF-8 그대로 출력)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
 # 전역 검색 엔진 인스턴스 (Lazy Initialization)
 _search_engine: Optional[SearchEngine] = None
 
 
+@lru_cache(maxsize=1)
+def get_es_config() -> ESConfig:
+    """환경 설정 기반 ElasticSearch 설정 (프로세스당 1회 생성, 도구 호출마다 재사용)"""
+    settings = get_settings()
+    return ESConfig(
+        host=settings.es_host,
+        port=settings.es_port,
+        username=settings.es_username,
+        password=settings.es_password,
+        index_name=settings.es_index,
+        knn_candidates_factor=settings.es_knn_candidates_factor
+    )
+
+
+def refresh_config() -> None:
+    """
+    환경변수를 다시 읽어 설정과 그에 묶인 연결/캐시를 초기화
+    
+    다음 도구 호출부터 새 설정으로 검색 엔진과 정책 인덱서를 다시 만듭니다.
+    """
+    global _search_engine
+    get_settings.cache_clear()
+    get_es_config.cache_clear()
+    _get_policy_indexer.cache_clear()
+    _search_cache.clear()
+    _search_engine = None
+
+
 def get_search_engine() -> SearchEngine:
     """
     검색 엔진 싱글톤 인스턴스 반환
@@ -48,14 +98,7 @@ def get_search_engine() -> SearchEngine:
     """
     global _search_engine
     if _search_engine is None:
-        config = ESConfig(
-            host=os.getenv("ES_HOST", "localhost"),
-            port=int(os.getenv("ES_PORT", "9200")),
-            username=os.getenv("ES_USERNAME"),
-            password=os.getenv("ES_PASSWORD"),
-            index_name=os.getenv("ES_INDEX", "realhome_apartments")
-        )
-        _search_engine = SearchEngine(config)
+        _search_engine = SearchEngine(get_es_config())
         _search_engine.connect()
     return _search_engine
 
@@ -100,6 +143,64 @@ class ApartmentSearchInput(BaseModel):
     )
 
 
+# 아파트 검색 결과 캐시: 에이전트가 같은 조건으로 다시 검색하면 ES/임베딩 호출 없이 반환
+# (성공 결과만 저장, 재인덱싱이 늦어도 TTL 안에 반영되도록 시간 제한)
+_SEARCH_CACHE_SIZE = 256
+_SEARCH_CACHE_TTL = 600  # 초
+_search_cache: "OrderedDict[tuple, Tuple[float, str]]" = OrderedDict()
+_search_cache_lock = threading.Lock()  # ToolNode가 도구를 병렬 스레드로 실행할 수 있음
+
+
+def _search_cache_get(key: tuple) -> Optional[str]:
+    """캐시된 검색 결과 (없거나 만료되면 None)"""
+    with _search_cache_lock:
+        entry = _search_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > _SEARCH_CACHE_TTL:
+            del _search_cache[key]
+            return None
+        _search_cache.move_to_end(key)
+        return result
+
+
+def _search_cache_put(key: tuple, result: str) -> None:
+    """검색 결과 저장 (최대 개수 초과 시 가장 오래 사용되지 않은 항목 제거)"""
+    with _search_cache_lock:
+        _search_cache[key] = (time.monotonic(), result)
+        _search_cache.move_to_end(key)
+        while len(_search_cache) > _SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
+
+
+def _summarize(text: Optional[str], limit: int = 200) -> Optional[str]:
+    """긴 장단점 텍스트를 limit자로 자르고 말줄임표 추가"""
+    return text[:limit] + '...' if text and len(text) > limit else text
+
+
+def _format_apartment(rank: int, apt: Dict[str, Any]) -> Dict[str, Any]:
+    """검색 결과 1건을 도구 응답 형식으로 변환 (필드마다 dict 조회는 한 번만)"""
+    get = apt.get
+    price = get('price_manwon')
+    area = get('area_m2')
+    review_score = get('review_score')
+    return {
+        "순위": rank,
+        "아파트명": get('kapt_name', '정보없음'),
+        "주소": get('doro_juso', get('dong', '정보없음')),
+        "구": get('gu', '정보없음'),
+        "가격": f"{price:,.0f}만원" if price else "시세확인필요",
+        "면적": f"{area:.1f}m²" if area else "정보없음",
+        "층": get('floor', '정보없음'),
+        "준공년도": get('year_built', '정보없음'),
+        "리뷰점수": f"{review_score:.1f}/5.0" if review_score else "리뷰없음",
+        "장점요약": _summarize(get('pros', '정보없음')),
+        "단점요약": _summarize(get('cons', '정보없음')),
+        "매칭점수": f"{get('_score', 0):.2f}"
+    }
+
+
 @tool(args_schema=ApartmentSearchInput)
 def search_apartment_tool(
     districts: Optional[List[str]] = None,
@@ -132,6 +233,18 @@ def search_apartment_tool(
     Returns:
         검색 결과 JSON 문자열
     """
+    # 같은 조건의 이전 검색 결과 재사용 (리스트 인자는 튜플로 고정해 키로 사용)
+    cache_key = (
+        tuple(districts) if districts is not None else None,
+        min_price, max_price, min_area, max_area,
+        tuple(lifestyle_keywords) if lifestyle_keywords is not None else None,
+        natural_query, top_k
+    )
+    cached = _search_cache_get(cache_key)
+    if cached is not None:
+        logger.info("아파트 검색 캐시 적중")
+        return cached
+    
     try:
         logger.info(f"아파트 검색 시작 - 조건: districts={districts}, price={min_price}-{max_price}, "
                    f"area={min_area}-{max_area}, keywords={lifestyle_keywords}")
@@ -160,23 +273,7 @@ def search_apartment_tool(
             }, ensure_ascii=False)
         
         # 결과 포맷팅
-        formatted_results = []
-        for i, apt in enumerate(results[:top_k], 1):
-            formatted = {
-                "순위": i,
-                "아파트명": apt.get('kapt_name', '정보없음'),
-                "주소": apt.get('doro_juso', apt.get('dong', '정보없음')),
-                "구": apt.get('gu', '정보없음'),
-                "가격": f"{apt.get('price_manwon', 0):,.0f}만원" if apt.get('price_manwon') else "시세확인필요",
-                "면적": f"{apt.get('area_m2', 0):.1f}m²" if apt.get('area_m2') else "정보없음",
-                "층": apt.get('floor', '정보없음'),
-                "준공년도": apt.get('year_built', '정보없음'),
-                "리뷰점수": f"{apt.get('review_score', 0):.1f}/5.0" if apt.get('review_score') else "리뷰없음",
-                "장점요약": (apt.get('pros', '')[:200] + '...') if apt.get('pros') and len(apt.get('pros', '')) > 200 else apt.get('pros', '정보없음'),
-                "단점요약": (apt.get('cons', '')[:200] + '...') if apt.get('cons') and len(apt.get('cons', '')) > 200 else apt.get('cons', '정보없음'),
-                "매칭점수": f"{apt.get('_score', 0):.2f}"
-            }
-            formatted_results.append(formatted)
+        formatted_results = [_format_apartment(i, apt) for i, apt in enumerate(results[:top_k], 1)]
         
         response = {
             "status": "success",
@@ -193,7 +290,9 @@ def search_apartment_tool(
         }
         
         logger.info(f"아파트 검색 완료: {len(formatted_results)}개 결과")
-        return json.dumps(response, ensure_ascii=False, indent=2)
+        result = _dumps(response)
+        _search_cache_put(cache_key, result)
+        return result
         
     except Exception as e:
         logger.error(f"아파트 검색 오류: {e}")
@@ -220,6 +319,28 @@ class PolicySearchInput(BaseModel):
     )
 
 
+@lru_cache(maxsize=4)
+def _get_policy_indexer(host: str, port: int, index_name: str):
+    """
+    정책 인덱서 싱글톤 (접속 정보별 1회 연결, 이후 호출은 같은 ES 커넥션 풀 재사용)
+    
+    연결에 실패하면 예외를 던져 캐시에 남지 않도록 하므로 다음 호출에서 다시 연결을 시도합니다.
+    
+    Raises:
+        ConnectionError: ElasticSearch 연결 실패
+    """
+    from policy_indexer import PolicyIndexer
+    
+    indexer = PolicyIndexer(host=host, port=port, index_name=index_name)
+    if not indexer.connect():
+        raise ConnectionError(f"ElasticSearch 연결 실패: {host}:{port}")
+    return indexer
+
+
+# 정책 검색 결과 포맷에 필요한 필드 (full_text는 하이라이트로만 사용하고 응답으로 받지 않음)
+_POLICY_SOURCE_FIELDS = ("title", "date", "keywords", "filename", "preview")
+
+
 @tool(args_schema=PolicySearchInput)
 def policy_search_tool(query: str, num_results: int = 5) -> str:
     """
@@ -238,21 +359,16 @@ def policy_search_tool(query: str, num_results: int = 5) -> str:
     try:
         logger.info(f"정책 검색 시작: {query}")
         
-        # ElasticSearch 연결
-        from policy_indexer import PolicyIndexer
-        
-        indexer = PolicyIndexer(
-            host=os.getenv("ES_HOST", "localhost"),
-            port=int(os.getenv("ES_PORT", "9200")),
-            index_name="realhome_policies"
-        )
-        
-        if not indexer.connect():
+        # ElasticSearch 연결 (프로세스 공용 인덱서 재사용)
+        es_config = get_es_config()
+        try:
+            indexer = _get_policy_indexer(es_config.host, es_config.port, "realhome_policies")
+        except ConnectionError:
             logger.warning("ElasticSearch 연결 실패. 더미 데이터 반환")
             return _get_dummy_policy_results(query)
         
         # 정책 검색
-        search_results = indexer.search(query, size=num_results)
+        search_results = indexer.search(query, size=num_results, source_includes=list(_POLICY_SOURCE_FIELDS))
         
         if not search_results:
             # 인덱스가 비어있거나 결과 없음 - 더미 데이터 반환
@@ -263,17 +379,15 @@ def policy_search_tool(query: str, num_results: int = 5) -> str:
         results = []
         for hit in search_results:
             doc = hit['document']
-            highlights = hit.get('highlights', {})
+            highlights = hit.get('highlights') or {}
             
             # 하이라이트된 텍스트 추출
-            snippet = ""
-            if 'full_text' in highlights:
-                snippet = " ... ".join(highlights['full_text'][:2])
-            elif 'sections.content' in highlights:
-                snippet = " ... ".join(highlights['sections.content'][:2])
+            fragments = highlights.get('full_text') or highlights.get('sections.content')
+            if fragments:
+                snippet = " ... ".join(fragments[:2])
             else:
-                # 하이라이트 없으면 문서 시작 부분
-                snippet = doc.get('full_text', '')[:200] + "..."
+                # 하이라이트 없으면 인덱싱 시 저장한 문서 시작 부분
+                snippet = doc.get('preview', '') + "..."
             
             result = {
                 "title": doc.get('title', ''),
@@ -295,7 +409,7 @@ def policy_search_tool(query: str, num_results: int = 5) -> str:
         }
         
         logger.info(f"정책 검색 완료: {len(results)}개 결과")
-        return json.dumps(response_data, ensure_ascii=False, indent=2)
+        return _dumps(response_data)
         
     except Exception as e:
         logger.error(f"정책 검색 오류: {e}")
@@ -303,66 +417,71 @@ def policy_search_tool(query: str, num_results: int = 5) -> str:
         return _get_dummy_policy_results(query)
 
 
+# 오프라인 더미 정책 데이터 (2025년 기준 주요 부동산 정책)
+_DUMMY_POLICIES = (
+    {
+        "title": "2025년 주택담보대출 LTV 규제 현황",
+        "snippet": "2025년 기준 규제지역 LTV: 무주택자 50%, 1주택자 30%. 비규제지역: 무주택자 70%, 1주택자 60%. 생애최초 주택구입자는 추가 우대 적용.",
+        "link": "https://www.fss.or.kr",
+        "source": "금융감독원",
+        "published_date": "2025-01-15"
+    },
+    {
+        "title": "DSR 규제 및 적용 기준 안내",
+        "snippet": "총부채원리금상환비율(DSR) 40% 규제 적용. 연소득 대비 모든 대출의 연간 원리금 상환액이 40%를 초과할 수 없음. 2025년부터 전 금융권 확대 적용.",
+        "link": "https://www.hf.go.kr",
+        "source": "한국주택금융공사",
+        "published_date": "2025-01-10"
+    },
+    {
+        "title": "생애최초 주택 구입자 금융 지원 정책",
+        "snippet": "생애최초 주택구입자: LTV 80% 특례, 저금리 대출(연 3.5%~4.0%), 취득세 감면(200만원 한도). 부부합산 연소득 9천만원 이하 대상.",
+        "link": "https://www.molit.go.kr",
+        "source": "국토교통부",
+        "published_date": "2025-02-01"
+    },
+    {
+        "title": "2025년 부동산 취득세 및 보유세 현황",
+        "snippet": "1주택자 취득세: 1~3% (가격별 차등), 다주택자 중과세: 8~12%. 종합부동산세: 공시가격 12억 초과 주택 대상, 세율 0.6~6.0%.",
+        "link": "https://www.nts.go.kr",
+        "source": "국세청",
+        "published_date": "2025-01-20"
+    },
+    {
+        "title": "청약 제도 및 특별공급 안내",
+        "snippet": "신혼부부 특별공급 30%, 생애최초 특별공급 25% 물량 배정. 청약가점제와 추첨제 병행 운영. 무주택 기간, 부양가족수, 청약통장 가입기간 반영.",
+        "link": "https://www.applyhome.co.kr",
+        "source": "청약홈",
+        "published_date": "2025-01-25"
+    }
+)
+# 키워드 필터링용 검색 대상 텍스트 (호출마다 제목+요약을 이어 붙이지 않도록 미리 생성)
+_DUMMY_POLICY_TEXTS = tuple(p["title"] + p["snippet"] for p in _DUMMY_POLICIES)
+
+
 def _get_dummy_policy_results(query: str) -> str:
     """
     API 키가 없거나 오류 시 반환할 더미 정책 데이터
     2025년 기준 주요 부동산 정책 정보 포함
     """
-    dummy_policies = [
-        {
-            "title": "2025년 주택담보대출 LTV 규제 현황",
-            "snippet": "2025년 기준 규제지역 LTV: 무주택자 50%, 1주택자 30%. 비규제지역: 무주택자 70%, 1주택자 60%. 생애최초 주택구입자는 추가 우대 적용.",
-            "link": "https://www.fss.or.kr",
-            "source": "금융감독원",
-            "published_date": "2025-01-15"
-        },
-        {
-            "title": "DSR 규제 및 적용 기준 안내",
-            "snippet": "총부채원리금상환비율(DSR) 40% 규제 적용. 연소득 대비 모든 대출의 연간 원리금 상환액이 40%를 초과할 수 없음. 2025년부터 전 금융권 확대 적용.",
-            "link": "https://www.hf.go.kr",
-            "source": "한국주택금융공사",
-            "published_date": "2025-01-10"
-        },
-        {
-            "title": "생애최초 주택 구입자 금융 지원 정책",
-            "snippet": "생애최초 주택구입자: LTV 80% 특례, 저금리 대출(연 3.5%~4.0%), 취득세 감면(200만원 한도). 부부합산 연소득 9천만원 이하 대상.",
-            "link": "https://www.molit.go.kr",
-            "source": "국토교통부",
-            "published_date": "2025-02-01"
-        },
-        {
-            "title": "2025년 부동산 취득세 및 보유세 현황",
-            "snippet": "1주택자 취득세: 1~3% (가격별 차등), 다주택자 중과세: 8~12%. 종합부동산세: 공시가격 12억 초과 주택 대상, 세율 0.6~6.0%.",
-            "link": "https://www.nts.go.kr",
-            "source": "국세청",
-            "published_date": "2025-01-20"
-        },
-        {
-            "title": "청약 제도 및 특별공급 안내",
-            "snippet": "신혼부부 특별공급 30%, 생애최초 특별공급 25% 물량 배정. 청약가점제와 추첨제 병행 운영. 무주택 기간, 부양가족수, 청약통장 가입기간 반영.",
-            "link": "https://www.applyhome.co.kr",
-            "source": "청약홈",
-            "published_date": "2025-01-25"
-        }
+    # 쿼리와 관련된 결과 필터링 (중복 키워드는 한 번만 검사)
+    keywords = set(query.split())
+    filtered = [
+        policy for policy, text in zip(_DUMMY_POLICIES, _DUMMY_POLICY_TEXTS)
+        if any(keyword in text for keyword in keywords)
     ]
     
-    # 쿼리와 관련된 결과 필터링
-    filtered = [p for p in dummy_policies if any(
-        keyword in p['title'] + p['snippet'] 
-        for keyword in query.split()
-    )]
-    
     if not filtered:
-        filtered = dummy_policies[:3]  # 기본 결과 반환
+        filtered = list(_DUMMY_POLICIES[:3])  # 기본 결과 반환
     
-    return json.dumps({
+    return _dumps({
         "status": "success",
         "query": query,
         "search_date": datetime.now().strftime("%Y-%m-%d %H:%M"),
         "note": "오프라인 정책 데이터 (실시간 검색을 위해서는 GOOGLE_API_KEY 설정 필요)",
         "total_found": len(filtered),
         "policies": filtered
-    }, ensure_ascii=False, indent=2)
+    })
 
 
 # ============================================================================
@@ -405,6 +524,30 @@ class LoanCalculatorInput(BaseModel):
     )
 
 
+# LTV 한도표 (2025년 규제 기준): (규제지역 여부, 보유주택 구간 0/1/2+, 생애최초 특례 여부) -> (LTV %, 적용 규제 문구)
+_LTV_TABLE = {
+    (True, 0, True): (80, "생애최초 주택구입자 LTV 80% 특례 적용"),
+    (True, 0, False): (50, "규제지역 무주택자 LTV 50% 적용"),
+    (True, 1, False): (30, "규제지역 1주택자 LTV 30% 적용 (주담대 원칙적 불가)"),
+    (True, 2, False): (0, "규제지역 다주택자 주담대 불가"),
+    (False, 0, True): (80, "생애최초 주택구입자 LTV 80% 특례 적용"),
+    (False, 0, False): (70, "비규제지역 무주택자 LTV 70% 적용"),
+    (False, 1, False): (60, "비규제지역 1주택자 LTV 60% 적용"),
+    (False, 2, False): (40, "비규제지역 다주택자 LTV 40% 적용"),
+}
+
+
+@lru_cache(maxsize=128)
+def _annuity_factor(monthly_rate: float, total_months: int) -> float:
+    """
+    원리금균등상환 연금현가계수 [(1+r)^n - 1] / [r * (1+r)^n] (r > 0)
+    
+    월 상환액 × 계수 = 대출 원금. 같은 금리/기간 조합이 반복되므로 (1+r)^n 계산을 캐시합니다.
+    """
+    pow_term = (1 + monthly_rate) ** total_months
+    return (pow_term - 1) / (monthly_rate * pow_term)
+
+
 @tool(args_schema=LoanCalculatorInput)
 def loan_calculator_tool(
     property_price: float,
@@ -443,34 +586,11 @@ def loan_calculator_tool(
         # ============================================================
         # 1. LTV 한도 결정 (2025년 규제 기준)
         # ============================================================
-        if is_regulated_area:
-            if house_count == 0:  # 무주택자
-                if is_first_home:
-                    ltv_limit = 80  # 생애최초 특례
-                    regulation_notes.append("생애최초 주택구입자 LTV 80% 특례 적용")
-                else:
-                    ltv_limit = 50  # 규제지역 무주택자
-                    regulation_notes.append("규제지역 무주택자 LTV 50% 적용")
-            elif house_count == 1:
-                ltv_limit = 30  # 규제지역 1주택자
-                regulation_notes.append("규제지역 1주택자 LTV 30% 적용 (주담대 원칙적 불가)")
-            else:
-                ltv_limit = 0  # 다주택자 대출 제한
-                regulation_notes.append("규제지역 다주택자 주담대 불가")
-        else:  # 비규제지역
-            if house_count == 0:
-                if is_first_home:
-                    ltv_limit = 80  # 생애최초 특례
-                    regulation_notes.append("생애최초 주택구입자 LTV 80% 특례 적용")
-                else:
-                    ltv_limit = 70  # 비규제지역 무주택자
-                    regulation_notes.append("비규제지역 무주택자 LTV 70% 적용")
-            elif house_count == 1:
-                ltv_limit = 60  # 비규제지역 1주택자
-                regulation_notes.append("비규제지역 1주택자 LTV 60% 적용")
-            else:
-                ltv_limit = 40  # 비규제지역 다주택자
-                regulation_notes.append("비규제지역 다주택자 LTV 40% 적용")
+        # 보유 주택 수는 0/1/다주택(2) 구간으로, 생애최초 특례는 무주택자에게만 적용
+        house_bucket = house_count if house_count in (0, 1) else 2
+        first_home = bool(is_first_home) and house_bucket == 0
+        ltv_limit, ltv_note = _LTV_TABLE[(bool(is_regulated_area), house_bucket, first_home)]
+        regulation_notes.append(ltv_note)
         
         # LTV 기준 최대 대출액
         ltv_max_loan = property_price * (ltv_limit / 100)
@@ -484,22 +604,18 @@ def loan_calculator_tool(
         # DSR 기준 최대 연간 원리금 상환 가능액
         max_annual_payment = (annual_income * dsr_limit / 100) - existing_debt_payment
         
+        # 원리금균등상환 연금현가계수 (DSR 역산과 월 상환액 계산에 공용, 무이자면 개월 수)
+        monthly_rate = interest_rate / 100 / 12
+        total_months = loan_term_years * 12
+        annuity_factor = _annuity_factor(monthly_rate, total_months) if monthly_rate > 0 else total_months
+        
         if max_annual_payment <= 0:
             dsr_max_loan = 0
             regulation_notes.append("⚠️ 기존 부채가 많아 추가 대출이 어렵습니다.")
         else:
             # 원리금균등상환 방식 대출 가능액 역산
             # P = A * [(1+r)^n - 1] / [r * (1+r)^n]
-            monthly_rate = interest_rate / 100 / 12
-            total_months = loan_term_years * 12
-            
-            if monthly_rate > 0:
-                annuity_factor = ((1 + monthly_rate) ** total_months - 1) / \
-                                (monthly_rate * (1 + monthly_rate) ** total_months)
-                monthly_payment = max_annual_payment / 12
-                dsr_max_loan = monthly_payment * annuity_factor
-            else:
-                dsr_max_loan = max_annual_payment * loan_term_years
+            dsr_max_loan = max_annual_payment / 12 * annuity_factor
         
         # ============================================================
         # 3. 최종 대출 가능액 (LTV, DSR 중 작은 값)
@@ -510,17 +626,7 @@ def loan_calculator_tool(
         required_down_payment = property_price - final_max_loan
         
         # 월 상환액 계산 (원리금균등상환)
-        if final_max_loan > 0:
-            monthly_rate = interest_rate / 100 / 12
-            total_months = loan_term_years * 12
-            if monthly_rate > 0:
-                monthly_payment = final_max_loan * \
-                    (monthly_rate * (1 + monthly_rate) ** total_months) / \
-                    ((1 + monthly_rate) ** total_months - 1)
-            else:
-                monthly_payment = final_max_loan / total_months
-        else:
-            monthly_payment = 0
+        monthly_payment = final_max_loan / annuity_factor if final_max_loan > 0 else 0
         
         # ============================================================
         # 4. 결과 생성
@@ -572,7 +678,7 @@ def loan_calculator_tool(
         }
         
         logger.info(f"대출 계산 완료 - 최대대출: {final_max_loan:,.0f}만원, 필요자기자본: {required_down_payment:,.0f}만원")
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return _dumps(result)
         
     except Exception as e:
         logger.error(f"대출 계산 오류: {e}")
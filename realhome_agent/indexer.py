@@ -26,9 +26,10 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def load_apartments_data(csv_path: str) -> List[Dict[str, Any]]:
+def load_apartments_data(csv_path: str) -> pd.DataFrame:
     """
     아파트 기본 정보 CSV 로드
+    (병합까지 컬럼 단위 DataFrame으로 유지하고, 레코드 dict 변환은 merge_data 마지막에 한 번만 수행)
     """
     logger.info(f"아파트 데이터 로드: {csv_path}")
     
@@ -41,7 +42,7 @@ def load_apartments_data(csv_path: str) -> List[Dict[str, Any]]:
     })
     
     logger.info(f"아파트 데이터 로드 완료: {len(df)} 건")
-    return df.to_dict('records')
+    return df
 
 
 def load_reviews_data(csv_path: str) -> pd.DataFrame:
@@ -50,16 +51,23 @@ def load_reviews_data(csv_path: str) -> pd.DataFrame:
     """
     logger.info(f"리뷰 데이터 로드: {csv_path}")
     
-    # 오류 행 skip 처리
-    df = pd.read_csv(csv_path, on_bad_lines='skip')
+    # 오류 행 skip 처리 (집계에 쓰는 컬럼만 파싱)
+    df = pd.read_csv(
+        csv_path,
+        on_bad_lines='skip',
+        usecols=['kaptName', 'Score', 'Pros', 'Cons']
+    )
     
-    # 아파트별 리뷰 집계
-    agg_df = df.groupby('kaptName').agg({
-        'Score': 'mean',
-        'Pros': lambda x: ' | '.join(x.dropna().astype(str).head(5)),
-        'Cons': lambda x: ' | '.join(x.dropna().astype(str).head(5))
-    }).reset_index()
+    # 아파트별 리뷰 집계: 평균 점수 + 장/단점은 각각 비어있지 않은 앞 5개를 ' | '로 연결
+    # (그룹마다 파이썬 람다를 호출하지 않고 head(5)로 먼저 잘라낸 뒤 str.join으로 집계)
+    agg_df = df.groupby('kaptName')['Score'].mean().rename('review_score').to_frame()
+    for col, out in (('Pros', 'pros'), ('Cons', 'cons')):
+        texts = df.loc[df[col].notna(), ['kaptName', col]]
+        texts = texts.groupby('kaptName', sort=False).head(5)
+        joined = texts[col].astype(str).groupby(texts['kaptName']).agg(' | '.join)
+        agg_df[out] = joined.reindex(agg_df.index, fill_value='')
     
+    agg_df = agg_df.reset_index()
     agg_df.columns = ['kapt_name', 'review_score', 'pros', 'cons']
     
     logger.info(f"리뷰 데이터 집계 완료: {len(agg_df)} 개 아파트")
@@ -72,20 +80,43 @@ def load_deals_data(csv_path: str) -> pd.DataFrame:
     """
     logger.info(f"실거래가 데이터 로드: {csv_path}")
     
-    df = pd.read_csv(csv_path)
-    df['deal_date'] = pd.to_datetime(df['deal_date'])
+    columns = ['apt_name', 'gu', 'dong', 'price_manwon', 'area_m2', 'floor', 'year_built', 'price_krw']
+    # deal_date는 ISO 형식(YYYY-MM-DD)이므로 읽는 시점에 포맷을 지정해 C 파서로 변환
+    df = pd.read_csv(
+        csv_path,
+        usecols=columns + ['deal_date'],
+        parse_dates=['deal_date'],
+        date_format='%Y-%m-%d'
+    )
     
-    # 아파트별 최신 거래 추출
-    latest_df = df.sort_values('deal_date', ascending=False).drop_duplicates('apt_name')
-    latest_df = latest_df[['apt_name', 'gu', 'dong', 'price_manwon', 'area_m2', 'floor', 'year_built', 'price_krw']]
+    # 아파트별 최신 거래 추출 (전체 정렬 없이 그룹별 최댓값 위치만 찾음, 날짜 없는 거래는 가장 오래된 것으로 취급)
+    deal_date = df['deal_date'].fillna(pd.Timestamp.min)
+    latest_idx = deal_date.groupby(df['apt_name'], sort=False, dropna=False).idxmax()
+    latest_df = df.loc[latest_idx, columns]
     latest_df = latest_df.rename(columns={'apt_name': 'kapt_name'})
     
     logger.info(f"실거래가 데이터 로드 완료: {len(latest_df)} 건")
     return latest_df
 
 
+def build_combined_review(df: pd.DataFrame) -> pd.Series:
+    """
+    pros/cons 컬럼으로 임베딩용 리뷰 텍스트를 벡터 연산으로 생성
+    (형식: "장점: ... 단점: ...", 둘 다 없으면 빈 문자열)
+    """
+    empty = pd.Series('', index=df.index)
+    parts = []
+    for col, label, sep in (('pros', '장점', ' '), ('cons', '단점', '')):
+        if col not in df.columns:
+            parts.append(empty)
+            continue
+        text = df[col].fillna('').astype(str)
+        parts.append((label + ': ' + text + sep).where(text != '', ''))
+    return parts[0] + parts[1]
+
+
 def merge_data(
-    apartments: List[Dict],
+    apartments: pd.DataFrame,
     reviews: pd.DataFrame,
     deals: pd.DataFrame
 ) -> List[Dict[str, Any]]:
@@ -94,19 +125,18 @@ def merge_data(
     """
     logger.info("데이터 병합 시작...")
     
-    # DataFrame 변환
-    apt_df = pd.DataFrame(apartments)
-    merged = apt_df
+    merged = apartments
     
+    # 리뷰/실거래가는 kapt_name을 인덱스로 올려 join (merge의 키 컬럼 해시 재구성·복사 없이 인덱스로 조회)
     # 리뷰 데이터 병합 (비어있지 않은 경우만)
     if not reviews.empty and 'kapt_name' in reviews.columns:
-        merged = merged.merge(reviews, on='kapt_name', how='left')
+        merged = merged.join(reviews.set_index('kapt_name'), on='kapt_name', how='left')
     else:
         logger.warning("리뷰 데이터가 비어있거나 kapt_name 컬럼이 없습니다.")
     
     # 실거래가 데이터 병합 (비어있지 않은 경우만)
     if not deals.empty and 'kapt_name' in deals.columns:
-        merged = merged.merge(deals, on='kapt_name', how='left', suffixes=('', '_deal'))
+        merged = merged.join(deals.set_index('kapt_name'), on='kapt_name', how='left', rsuffix='_deal')
     else:
         logger.warning("실거래가 데이터가 비어있거나 kapt_name 컬럼이 없습니다.")
     
@@ -115,6 +145,9 @@ def merge_data(
         merged['gu'] = merged['gu'].fillna(merged['gu_deal'])
         merged = merged.drop(columns=['gu_deal'])
     
+    # 임베딩용 리뷰 텍스트 (행 단위 루프 대신 컬럼 연산)
+    merged['combined_review'] = build_combined_review(merged)
+    
     # NaN 처리 - JSON 직렬화를 위해 None으로 변환
     merged = merged.where(pd.notnull(merged), None)
     
@@ -157,11 +190,10 @@ def index_data(documents: List[Dict[str, Any]], config: ESConfig) -> None:
         logger.error("인덱스 생성 실패")
         return
     
-    # 벌크 인덱싱
+    # 벌크 인덱싱 (임베딩 배치는 장치별 기본값, ES 요청 크기/동시성은 ESConfig 설정)
     success, fail = engine.bulk_index_documents(
         documents,
-        generate_embeddings=True,
-        batch_size=50
+        generate_embeddings=True
     )
     
     logger.info(f"인덱싱 완료: 성공 {success}, 실패 {fail}")
@@ -191,7 +223,7 @@ def main():
         apartments = load_apartments_data(apartments_csv)
     except Exception as e:
         logger.error(f"아파트 데이터 로드 실패: {e}")
-        apartments = []
+        apartments = pd.DataFrame()
     
     try:
         reviews = load_reviews_data(reviews_csv)
@@ -205,7 +237,7 @@ def main():
         logger.error(f"실거래가 데이터 로드 실패: {e}")
         deals = pd.DataFrame()
     
-    if not apartments:
+    if apartments.empty:
         logger.error("인덱싱할 데이터가 없습니다.")
         return
     
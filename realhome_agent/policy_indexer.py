@@ -221,6 +221,7 @@ class PolicyDocumentParser:
             "year": date_info.get('year', ''),
             "month": date_info.get('month', ''),
             "full_text": text,
+            "preview": text[:200],  # 하이라이트 없을 때 쓰는 스니펫 (검색 시 full_text 슬라이싱 방지)
             "sections": sections,
             "keywords": keywords,
             "indexed_at": datetime.now().isoformat(),
@@ -284,6 +285,7 @@ class PolicyIndexer:
                             "keyword": {"type": "keyword", "ignore_above": 256}
                         }
                     },
+                    "preview": {"type": "text", "index": False},
                     "sections": {
                         "type": "nested",
                         "properties": {
@@ -339,11 +341,17 @@ class PolicyIndexer:
             logger.error(f"벌크 인덱싱 실패: {e}")
             return 0, len(documents)
     
-    def search(self, query: str, size: int = 10) -> List[Dict]:
-        """정책 검색"""
+    def search(
+        self,
+        query: str,
+        size: int = 10,
+        source_includes: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """정책 검색 (source_includes 지정 시 해당 필드만 _source로 반환)"""
         try:
             response = self.es.search(
                 index=self.index_name,
+                _source_includes=source_includes,
                 body={
                     "query": {
                         "multi_match": {
@@ -9,14 +9,19 @@ Version: 1.0.0
 """
 
 import os
+import time
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import numpy as np
 
 from elasticsearch import Elasticsearch, helpers
 from elasticsearch.exceptions import ConnectionError, NotFoundError, RequestError
 
+# 멀티 세션 서버에서 fork 후 토크나이저 병렬화 경고가 반복 출력되지 않도록 (transformers import 전에 설정)
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
 import torch
 from transformers import AutoTokenizer, AutoModel
 
@@ -30,9 +35,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True)
 class ESConfig:
-    """ElasticSearch 설정 클래스"""
+    """ElasticSearch 설정 클래스 (불변, 해시 가능하므로 캐시 키로 사용 가능)"""
     host: str = "localhost"
     port: int = 9200
     scheme: str = "http"
@@ -40,6 +45,12 @@ class ESConfig:
     password: Optional[str] = None
     index_name: str = "realhome_apartments"
     embedding_dim: int = 1024  # BAAI/bge-m3 출력 차원
+    knn_candidates_factor: int = 2  # kNN num_candidates = top_k × factor (HNSW 탐색 폭, recall↔지연 트레이드오프)
+    # 벌크 인덱싱 (parallel_bulk): 동시 요청 스레드 수, 스레드별 대기 청크 수, 요청당 문서 수
+    bulk_thread_count: int = field(default_factory=lambda: min(8, os.cpu_count() or 1))
+    bulk_queue_size: int = 4
+    bulk_chunk_size: int = 500
+    bulk_max_retries: int = 3  # 429(클러스터 과부하) 거절 문서 재시도 횟수
 
 
 class EmbeddingModel:
@@ -60,6 +71,24 @@ class EmbeddingModel:
         self.model_name = model_name or os.getenv("EMBEDDING_MODEL", "BAAI/bge-m3")
         device_env = os.getenv("EMBEDDING_DEVICE", "cpu")
         self.device = torch.device(device_env if device_env == "cuda" and torch.cuda.is_available() else "cpu")
+        # GPU에서는 fp16 추론 (Tensor Core 활용), EMBEDDING_FP16=false로 비활성화
+        self.use_fp16 = self.device.type == "cuda" and os.getenv("EMBEDDING_FP16", "true").lower() == "true"
+        # bf16 지원 GPU(Ampere+)에서는 EMBEDDING_BF16=true로 fp16 대신 bf16 사용 (지수 범위가 fp32와 같아 오버플로 없음)
+        self.use_bf16 = (
+            self.use_fp16
+            and os.getenv("EMBEDDING_BF16", "false").lower() == "true"
+            and torch.cuda.is_bf16_supported()
+        )
+        # CPU에서는 EMBEDDING_INT8=true로 Linear 레이어 동적 int8 양자화 (메모리/연산량 감소)
+        self.use_int8 = self.device.type == "cpu" and os.getenv("EMBEDDING_INT8", "false").lower() == "true"
+        # encode() 기본 배치 크기 (GPU는 큰 배치가 유리)
+        self.batch_size = int(os.getenv("EMBEDDING_BATCH_SIZE", "128" if self.device.type == "cuda" else "32"))
+        # torch.compile 적용 여부 (GPU 전용, 첫 배치에서 컴파일 시간이 들므로 EMBEDDING_COMPILE=true일 때만)
+        self.use_compile = (
+            self.device.type == "cuda"
+            and hasattr(torch, "compile")
+            and os.getenv("EMBEDDING_COMPILE", "false").lower() == "true"
+        )
         self.tokenizer = None
         self.model = None
         self._is_loaded = False
@@ -74,20 +103,32 @@ class EmbeddingModel:
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
             self.model = AutoModel.from_pretrained(self.model_name)
             self.model.to(self.device)
+            if self.use_bf16:
+                self.model.to(torch.bfloat16)
+            elif self.use_fp16:
+                self.model.half()
             self.model.eval()
+            if self.use_int8:
+                self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+            if self.use_compile:
+                # 시퀀스 길이가 배치마다 달라지므로 dynamic=True (입력 패딩도 32 배수로 맞춰 재컴파일 최소화)
+                self.model = torch.compile(self.model, dynamic=True)
             self._is_loaded = True
-            logger.info(f"임베딩 모델 로드 완료 (device: {self.device})")
+            logger.info(
+                f"임베딩 모델 로드 완료 (device: {self.device}, fp16: {self.use_fp16}, bf16: {self.use_bf16}, "
+                f"int8: {self.use_int8}, compile: {self.use_compile})"
+            )
         except Exception as e:
             logger.error(f"임베딩 모델 로드 실패: {e}")
             raise
     
-    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+    def encode(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
         """
         텍스트를 임베딩 벡터로 변환
         
         Args:
             texts: 변환할 텍스트 리스트
-            batch_size: 배치 크기
+            batch_size: 배치 크기 (기본값: EMBEDDING_BATCH_SIZE)
             
         Returns:
             임베딩 벡터 배열 (shape: [len(texts), embedding_dim])
@@ -95,6 +136,7 @@ class EmbeddingModel:
         if not self._is_loaded:
             self.load()
         
+        batch_size = batch_size or self.batch_size
         all_embeddings = []
         
         for i in range(0, len(texts), batch_size):
@@ -107,15 +149,17 @@ class EmbeddingModel:
                     padding=True,
                     truncation=True,
                     max_length=512,
+                    pad_to_multiple_of=32 if self.use_compile else None,
                     return_tensors="pt"
                 ).to(self.device)
                 
-                # 임베딩 생성
-                with torch.no_grad():
+                # 임베딩 생성 (inference_mode: autograd 버전 카운터/뷰 추적까지 생략)
+                with torch.inference_mode():
                     outputs = self.model(**inputs)
                     # Mean pooling
                     attention_mask = inputs['attention_mask']
-                    token_embeddings = outputs.last_hidden_state
+                    # fp16/bf16 출력은 합산 시 오버플로/정밀도 손실 방지를 위해 fp32로 풀링
+                    token_embeddings = outputs.last_hidden_state.float()
                     input_mask_expanded = attention_mask.unsqueeze(-1).expand(token_embeddings.size()).float()
                     embeddings = torch.sum(token_embeddings * input_mask_expanded, 1) / torch.clamp(input_mask_expanded.sum(1), min=1e-9)
                 
@@ -143,6 +187,30 @@ class EmbeddingModel:
         return embeddings[0].tolist()
 
 
+@lru_cache(maxsize=4)
+def _cached_embedding_model(model_name: str) -> EmbeddingModel:
+    return EmbeddingModel(model_name=model_name)
+
+
+def get_embedding_model(model_name: str = None) -> EmbeddingModel:
+    """
+    프로세스 공용 임베딩 모델 반환
+    
+    가중치는 로드 후 변경되지 않으므로 모델명별로 하나만 만들어
+    SearchEngine 인스턴스(세션, 인덱서 등) 사이에서 공유합니다.
+    
+    Args:
+        model_name: HuggingFace 모델 이름 (기본값: EMBEDDING_MODEL 환경변수)
+    """
+    return _cached_embedding_model(model_name or os.getenv("EMBEDDING_MODEL", "BAAI/bge-m3"))
+
+
+def _bulk_item_status(info: Dict[str, Any]) -> Optional[int]:
+    """bulk 결과 항목({"index": {..., "status": 429}})의 HTTP 상태 코드"""
+    item = next(iter(info.values()), None) if info else None
+    return item.get("status") if isinstance(item, dict) else None
+
+
 class SearchEngine:
     """
     ElasticSearch 기반 하이브리드 검색 엔진
@@ -213,7 +281,14 @@ class SearchEngine:
                     "type": "dense_vector",
                     "dims": 1024,  # BAAI/bge-m3 차원
                     "index": True,
-                    "similarity": "cosine"
+                    "similarity": "cosine",
+                    # int8 스칼라 양자화 HNSW (ES 8.12+): 벡터 메모리 ~1/4, recall 손실 미미
+                    # 그래프 파라미터는 기본값 m=16, ef_construction=100보다 recall 우선
+                    "index_options": {
+                        "type": "int8_hnsw",
+                        "m": 32,
+                        "ef_construction": 200
+                    }
                 }
             }
         }
@@ -228,8 +303,12 @@ class SearchEngine:
         """
         self.config = config or ESConfig()
         self.client: Optional[Elasticsearch] = None
-        self.embedding_model = EmbeddingModel()
+        self.embedding_model = get_embedding_model()
         
+    def _num_candidates(self, top_k: int) -> int:
+        """kNN 후보 수 (ES 제약: k 이상, 10000 이하)"""
+        return min(10000, max(top_k, top_k * self.config.knn_candidates_factor))
+    
     def connect(self, max_retries: int = 10, retry_delay: int = 5) -> bool:
         """
         ElasticSearch 연결 (재시도 로직 포함)
@@ -241,8 +320,6 @@ class SearchEngine:
         Returns:
             연결 성공 여부
         """
-        import time
-        
         # 클라이언트 설정
         es_config = {
             "hosts": [f"{self.config.scheme}://{self.config.host}:{self.config.port}"],
@@ -271,6 +348,20 @@ class SearchEngine:
         logger.error(f"ElasticSearch 연결 실패: {max_retries}회 시도 후 포기")
         return False
     
+    def is_connected(self) -> bool:
+        """
+        현재 연결 상태 확인 (기존 클라이언트의 커넥션 풀로 ping, 재연결하지 않음)
+        
+        Returns:
+            클러스터 응답 여부
+        """
+        if not self.client:
+            return False
+        try:
+            return bool(self.client.ping())
+        except Exception:
+            return False
+    
     def create_index(self, delete_existing: bool = False) -> bool:
         """
         인덱스 생성
@@ -355,15 +446,21 @@ class SearchEngine:
         self,
         documents: List[Dict[str, Any]],
         generate_embeddings: bool = True,
-        batch_size: int = 100
+        batch_size: Optional[int] = None,
+        chunk_size: Optional[int] = None
     ) -> Tuple[int, int]:
         """
         대량 문서 인덱싱
         
+        임베딩 배치(모델 forward 1회당 문서 수)와 ES bulk 요청 크기는 최적값이 달라 따로 지정합니다.
+        bulk 요청은 parallel_bulk로 여러 스레드에서 동시에 보내며, 클러스터가 429로 거절한 문서는
+        스레드 수를 절반으로 줄이고 잠시 대기한 뒤 재시도합니다.
+        
         Args:
             documents: 인덱싱할 문서 리스트
             generate_embeddings: 임베딩 생성 여부
-            batch_size: 배치 크기
+            batch_size: 임베딩 배치 크기 (기본값: EMBEDDING_BATCH_SIZE, 장치별 기본값)
+            chunk_size: ES bulk 요청 1회당 문서 수 (기본값: ESConfig.bulk_chunk_size)
             
         Returns:
             (성공 수, 실패 수) 튜플
@@ -381,18 +478,22 @@ class SearchEngine:
                 logger.info("임베딩 생성 중...")
                 texts = []
                 for doc in documents:
-                    combined = ""
-                    if doc.get('pros'):
-                        combined += f"장점: {doc['pros']} "
-                    if doc.get('cons'):
-                        combined += f"단점: {doc['cons']}"
+                    # indexer.merge_data가 미리 만든 combined_review가 있으면 재사용
+                    combined = doc.get('combined_review')
+                    if combined is None:
+                        combined = ""
+                        if doc.get('pros'):
+                            combined += f"장점: {doc['pros']} "
+                        if doc.get('cons'):
+                            combined += f"단점: {doc['cons']}"
                     texts.append(combined if combined.strip() else "정보 없음")
                 
-                embeddings = self.embedding_model.encode(texts, batch_size=batch_size)
+                # 전체 문서를 batch_size 단위 forward로 한 번에 임베딩한 뒤 한 번에 리스트로 변환
+                embeddings = self.embedding_model.encode(texts, batch_size=batch_size).tolist()
                 
-                for i, doc in enumerate(documents):
-                    doc['embedding'] = embeddings[i].tolist()
-                    doc['combined_review'] = texts[i]
+                for doc, text, embedding in zip(documents, texts, embeddings):
+                    doc['embedding'] = embedding
+                    doc['combined_review'] = text
             
             # 벌크 인덱싱 액션 생성
             actions = []
@@ -404,17 +505,44 @@ class SearchEngine:
                 }
                 actions.append(action)
             
-            # 벌크 인덱싱 실행
+            # 벌크 인덱싱 실행 (결과는 입력 순서대로 반환되므로 액션과 짝지어 거절 문서를 추림)
             logger.info(f"벌크 인덱싱 시작: {len(actions)} 문서")
-            success, failed = helpers.bulk(
-                self.client,
-                actions,
-                raise_on_error=False,
-                raise_on_exception=False
-            )
+            chunk_size = chunk_size or self.config.bulk_chunk_size
+            thread_count = max(1, self.config.bulk_thread_count)
+            pending = actions
+            failed = []
+            for attempt in range(self.config.bulk_max_retries + 1):
+                rejected = []
+                results = helpers.parallel_bulk(
+                    self.client,
+                    pending,
+                    thread_count=thread_count,
+                    queue_size=self.config.bulk_queue_size,
+                    chunk_size=chunk_size,
+                    raise_on_error=False,
+                    raise_on_exception=False
+                )
+                for action, (ok, info) in zip(pending, results):
+                    if ok:
+                        success_count += 1
+                    elif _bulk_item_status(info) == 429 and attempt < self.config.bulk_max_retries:
+                        rejected.append(action)
+                    else:
+                        failed.append(info)
+                
+                if not rejected:
+                    break
+                
+                # 클러스터 과부하: 동시 요청을 줄이고 대기 후 거절된 문서만 재시도
+                thread_count = max(1, thread_count // 2)
+                logger.warning(
+                    f"벌크 인덱싱 429 거절 {len(rejected)}건: "
+                    f"스레드 {thread_count}개로 재시도 ({attempt + 1}/{self.config.bulk_max_retries})"
+                )
+                time.sleep(2 ** attempt)
+                pending = rejected
             
-            success_count = success
-            fail_count = len(failed) if isinstance(failed, list) else 0
+            fail_count = len(failed)
             
             # 실패 원인 로깅
             if failed:
@@ -425,7 +553,7 @@ class SearchEngine:
             
         except Exception as e:
             logger.error(f"벌크 인덱싱 오류: {e}")
-            fail_count = len(documents)
+            fail_count = len(documents) - success_count
         
         return success_count, fail_count
     
@@ -483,7 +611,7 @@ class SearchEngine:
                     "field": "embedding",
                     "query_vector": query_embedding,
                     "k": query.top_k,
-                    "num_candidates": query.top_k * 2,
+                    "num_candidates": self._num_candidates(query.top_k),
                     "boost": vector_weight
                 }
             }
@@ -586,7 +714,7 @@ class SearchEngine:
                     "field": "embedding",
                     "query_vector": query_embedding,
                     "k": top_k,
-                    "num_candidates": top_k * 2
+                    "num_candidates": self._num_candidates(top_k)
                 }
             }
             
@@ -611,6 +739,66 @@ class SearchEngine:
             logger.error(f"벡터 검색 오류: {e}")
             return []
     
+    def vector_search_many(
+        self,
+        texts: List[str],
+        top_k: int = 10,
+        filter_conditions: Optional[List[Dict]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        여러 텍스트에 대한 Dense Vector 검색을 한 번에 수행
+        
+        쿼리 임베딩을 배치 1회로 계산하고 _msearch 요청 1회로 검색하여,
+        쿼리마다 모델 호출과 HTTP 왕복을 반복하지 않습니다.
+        
+        Args:
+            texts: 검색 텍스트 리스트
+            top_k: 쿼리당 반환할 결과 수
+            filter_conditions: 모든 쿼리에 공통 적용할 필터 조건
+            
+        Returns:
+            입력 순서와 같은 쿼리별 검색 결과 리스트
+        """
+        if not self.client:
+            logger.error("ElasticSearch 연결이 필요합니다.")
+            return [[] for _ in texts]
+        if not texts:
+            return []
+        
+        try:
+            query_embeddings = self.embedding_model.encode(list(texts))
+            
+            searches: List[Dict[str, Any]] = []
+            for query_embedding in query_embeddings:
+                knn = {
+                    "field": "embedding",
+                    "query_vector": query_embedding.tolist(),
+                    "k": top_k,
+                    "num_candidates": self._num_candidates(top_k)
+                }
+                if filter_conditions:
+                    knn["filter"] = {"bool": {"filter": filter_conditions}}
+                searches.append({"index": self.config.index_name})
+                searches.append({"size": top_k, "knn": knn})
+            
+            response = self.client.msearch(searches=searches)
+            
+            all_results = []
+            for item in response['responses']:
+                results = []
+                for hit in item.get('hits', {}).get('hits', []):
+                    result = hit['_source']
+                    result['_score'] = hit['_score']
+                    result['_id'] = hit['_id']
+                    results.append(result)
+                all_results.append(results)
+            
+            return all_results
+            
+        except Exception as e:
+            logger.error(f"배치 벡터 검색 오류: {e}")
+            return [[] for _ in texts]
+    
     def _build_bm25_query(self, query: SearchQuery) -> List[Dict]:
         """BM25 쿼리 조건 생성"""
         should_queries = []
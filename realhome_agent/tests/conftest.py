@@ -0,0 +1,34 @@
+"""
+pytest 공용 설정
+================
+테스트 간 공유 상태 초기화
+"""
+
+import sys
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _clear_shared_clients():
+    """
+    설정/공용 LLM/도구/검색 결과 캐시 초기화
+    
+    환경변수 패치와 ChatOpenAI/get_all_tools/검색 엔진 모킹이 테스트마다 새로 적용되도록,
+    이미 로드된 모듈만 캐시를 비웁니다. (모듈을 직접 import하지 않음)
+    """
+    def _clear():
+        config = sys.modules.get("config")
+        if config is not None:
+            config.get_settings.cache_clear()
+        custom_tools = sys.modules.get("custom_tools")
+        if custom_tools is not None:
+            custom_tools.refresh_config()
+        agent_core = sys.modules.get("agent_core")
+        if agent_core is not None:
+            agent_core.get_shared_llm.cache_clear()
+            agent_core.get_shared_tools.cache_clear()
+    
+    _clear()
+    yield
+    _clear()
@@ -11,6 +11,7 @@ import pytest
 from unittest.mock import Mock, MagicMock, patch
 import sys
 import os
+import json
 
 # 상위 디렉토리 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,7 +22,10 @@ from agent_core import (
     SessionManager,
     quick_chat,
     session_manager,
-    get_system_prompt
+    get_system_prompt,
+    get_date_message_for,
+    build_agent_prompt,
+    STATIC_SYSTEM_MESSAGE
 )
 
 
@@ -151,6 +155,24 @@ class TestQueryParser:
 class TestSessionManager:
     """SessionManager 테스트"""
     
+    @patch('agent_core.get_all_tools', return_value=[])
+    @patch('agent_core.ChatOpenAI')
+    @patch('agent_core.create_react_agent')
+    @patch('agent_core.MemorySaver')
+    def test_sessions_share_llm_and_tools(self, mock_memory, mock_create_agent, mock_llm, mock_tools):
+        """세션 간 LLM 클라이언트와 도구 공유, 대화 메모리는 분리"""
+        mock_memory.side_effect = lambda: MagicMock()
+        manager = SessionManager()
+        
+        agent_a = manager.get_or_create_session("shared_a")
+        agent_b = manager.get_or_create_session("shared_b")
+        
+        assert agent_a.llm is agent_b.llm
+        assert agent_a.tools == agent_b.tools
+        assert agent_a.memory is not agent_b.memory
+        mock_llm.assert_called_once()
+        mock_tools.assert_called_once()
+    
     def test_get_or_create_new_session(self):
         """새 세션 생성"""
         manager = SessionManager()
@@ -176,6 +198,22 @@ class TestSessionManager:
             assert agent1 is agent2
             assert MockAgent.call_count == 1  # 한 번만 생성
     
+    def test_lru_eviction(self):
+        """최대 세션 수 초과 시 가장 오래 사용되지 않은 세션 제거"""
+        manager = SessionManager(max_sessions=2)
+        
+        with patch('agent_core.RealHomeAgent') as MockAgent:
+            MockAgent.side_effect = lambda **kwargs: MagicMock()
+            agent_a = manager.get_or_create_session("lru_a")
+            manager.get_or_create_session("lru_b")
+            manager.get_or_create_session("lru_a")  # a를 최근 사용으로 갱신
+            manager.get_or_create_session("lru_c")  # b 제거
+            
+            assert manager.get_or_create_session("lru_a") is agent_a
+            assert MockAgent.call_count == 3
+            manager.get_or_create_session("lru_b")  # 제거되었으므로 새로 생성
+            assert MockAgent.call_count == 4
+    
     def test_delete_session(self):
         """세션 삭제"""
         manager = SessionManager()
@@ -248,6 +286,84 @@ class TestRealHomeAgent:
         assert "아파트" in response
         mock_agent.invoke.assert_called_once()
     
+    @patch('agent_core.ChatOpenAI')
+    @patch('agent_core.create_react_agent')
+    @patch('agent_core.MemorySaver')
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    def test_chat_stream(self, mock_memory, mock_create_agent, mock_llm):
+        """스트리밍 채팅 테스트 (도구 호출 메시지 제외)"""
+        from langchain_core.messages import AIMessageChunk, ToolMessage
+        
+        mock_llm.return_value = MagicMock()
+        mock_memory.return_value = MagicMock()
+        
+        mock_agent = MagicMock()
+        mock_agent.stream.return_value = iter([
+            (ToolMessage(content='{"results": []}', tool_call_id="call_1"), {"langgraph_node": "tools"}),
+            (AIMessageChunk(content="송파구 "), {"langgraph_node": "agent"}),
+            (AIMessageChunk(content="아파트입니다."), {"langgraph_node": "agent"}),
+        ])
+        mock_create_agent.return_value = mock_agent
+        
+        agent = RealHomeAgent(verbose=False)
+        tokens = list(agent.chat_stream("송파구 아파트"))
+        
+        assert "".join(tokens) == "송파구 아파트입니다."
+        assert agent.get_chat_history()[-1]["content"] == "송파구 아파트입니다."
+    
+    @patch('agent_core.ChatOpenAI')
+    @patch('agent_core.create_react_agent')
+    @patch('agent_core.MemorySaver')
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    def test_chat_greeting_skips_agent(self, mock_memory, mock_create_agent, mock_llm):
+        """인사말은 에이전트(LLM) 호출 없이 응답"""
+        mock_memory.return_value = MagicMock()
+        mock_agent = MagicMock()
+        mock_create_agent.return_value = mock_agent
+
+        agent = RealHomeAgent(verbose=False)
+        response = agent.chat("안녕하세요!")
+
+        assert "리얼홈" in response
+        mock_agent.invoke.assert_not_called()
+        mock_agent.update_state.assert_called_once()
+        assert agent.route_counts["greeting"] == 1
+
+    @patch('agent_core.ChatOpenAI')
+    @patch('agent_core.create_react_agent')
+    @patch('agent_core.MemorySaver')
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    def test_chat_direct_search(self, mock_memory, mock_create_agent, mock_llm):
+        """필터 검색으로 지역/가격/면적이 모두 주어지면 검색 도구를 직접 호출, 채팅 입력은 에이전트로"""
+        mock_memory.return_value = MagicMock()
+        mock_agent = MagicMock()
+        mock_create_agent.return_value = mock_agent
+
+        search_tool = MagicMock()
+        search_tool.name = "search_apartment_tool"
+        search_tool.invoke.return_value = json.dumps({
+            "status": "success",
+            "search_conditions": {"지역": ["송파구"], "가격범위": "70000~79999만원", "면적범위": "99~115m²"},
+            "apartments": [{
+                "순위": 1, "아파트명": "테스트아파트", "구": "송파구", "가격": "75,000만원",
+                "면적": "105.0m²", "준공년도": 2010, "리뷰점수": "4.5/5.0"
+            }]
+        }, ensure_ascii=False)
+
+        agent = RealHomeAgent(verbose=False, tools=[search_tool])
+        response = agent.chat("7억대 송파구 30평대 아파트", direct_search=True)
+
+        assert "테스트아파트" in response
+        mock_agent.invoke.assert_not_called()
+        assert search_tool.invoke.call_args[0][0]["districts"] == ["송파구"]
+        assert agent.route_counts["direct_search"] == 1
+
+        agent.chat("7억대 송파구 30평대 아파트")
+
+        mock_agent.invoke.assert_called_once()
+        assert search_tool.invoke.call_count == 1
+        assert agent.route_counts["agent"] == 1
+
     @patch('agent_core.ChatOpenAI')
     @patch('agent_core.create_react_agent')
     @patch('agent_core.MemorySaver')
@@ -282,6 +398,28 @@ class TestRealHomeAgent:
         history = agent.get_chat_history()
         assert len(history) == 0
     
+    @patch('agent_core.ChatOpenAI')
+    @patch('agent_core.create_react_agent')
+    @patch('agent_core.MemorySaver')
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    def test_chat_history_bounded(self, mock_memory, mock_create_agent, mock_llm):
+        """대화 기록 최대 길이 제한 테스트"""
+        from langchain_core.messages import AIMessage
+        
+        mock_llm.return_value = MagicMock()
+        mock_memory.return_value = MagicMock()
+        mock_agent = MagicMock()
+        mock_agent.invoke.return_value = {"messages": [AIMessage(content="응답")]}
+        mock_create_agent.return_value = mock_agent
+        
+        agent = RealHomeAgent(max_memory_tokens=128, verbose=False)  # 최대 4개 메시지
+        for i in range(5):
+            agent.chat(f"질문 {i}")
+        
+        history = agent.get_chat_history()
+        assert len(history) == 4
+        assert history[0]["content"] == "질문 3"
+    
     @patch('agent_core.ChatOpenAI')
     @patch('agent_core.create_react_agent')
     @patch('agent_core.MemorySaver')
@@ -327,6 +465,25 @@ class TestSystemPrompt:
         """시스템 프롬프트에 현재 날짜 포함"""
         prompt = get_system_prompt()
         assert "현재 날짜:" in prompt
+    
+    def test_date_message_cached_per_date(self):
+        """같은 날짜의 날짜 메시지는 동일 객체 재사용"""
+        first = get_date_message_for("2025년 01월 01일")
+        
+        assert get_date_message_for("2025년 01월 01일") is first
+        assert "2025년 01월 01일" in first.content
+    
+    def test_agent_prompt_static_prefix(self):
+        """에이전트 입력은 정적 프롬프트로 시작하고 날짜는 별도 메시지"""
+        from langchain_core.messages import HumanMessage
+        
+        user_message = HumanMessage(content="안녕")
+        messages = build_agent_prompt({"messages": [user_message]})
+        
+        assert messages[0] is STATIC_SYSTEM_MESSAGE
+        assert "현재 날짜" not in messages[0].content
+        assert messages[1].content.startswith("현재 날짜:")
+        assert messages[-1] is user_message
 
 
 class TestQueryParserEdgeCases:
@@ -373,6 +530,32 @@ class TestQueryParserEdgeCases:
         result = QueryParser.parse("운동하기 좋은 아파트")
         
         assert "운동" in result["lifestyle_keywords"]
+    
+    def test_parse_cached_result_isolated(self):
+        """캐시된 파싱 결과를 수정해도 다음 호출에 영향 없음"""
+        first = QueryParser.parse("송파 아이 키우기 좋은 아파트")
+        first["districts"].append("마포구")
+        first["lifestyle_keywords"].clear()
+        
+        second = QueryParser.parse("송파 아이 키우기 좋은 아파트")
+        assert second["districts"] == ["송파구"]
+        assert "육아" in second["lifestyle_keywords"]
+    
+    def test_parse_spaced_units(self):
+        """숫자와 단위 사이 띄어쓰기 허용 ("7 억대", "30 평대")"""
+        result = QueryParser.parse("7 억대 30 평대 아파트")
+        
+        assert result["min_price"] == 70000
+        assert result["max_price"] == 79999
+        assert result["min_area"] == 99
+        assert result["natural_query"] == "7 억대 30 평대 아파트"
+    
+    def test_parse_overlapping_keywords(self):
+        """키워드가 겹쳐 있어도 모두 인식 ("8억대" + "대흥동")"""
+        result = QueryParser.parse("8억대흥동 아파트")
+        
+        assert result["min_price"] == 80000
+        assert result["districts"] == ["마포구"]
 
 
 class TestQuickChat:
@@ -0,0 +1,49 @@
+"""
+Config 테스트
+=============
+config.py의 환경변수 설정 로딩 테스트
+
+실행: pytest tests/test_config.py -v
+"""
+
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+# 상위 디렉토리 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Settings, get_settings
+
+
+class TestSettings:
+    """Settings / get_settings 테스트"""
+    
+    @patch.dict(os.environ, {}, clear=True)
+    def test_defaults(self):
+        """환경변수 미설정 시 기본값"""
+        settings = get_settings()
+        
+        assert settings.openai_api_key is None
+        assert settings.openai_model is None
+        assert settings.es_host == "localhost"
+        assert settings.es_port == 9200
+        assert settings.agent_session_cache == 64
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "ES_PORT": "9201", "OPENAI_TEMPERATURE": "0.7"})
+    def test_reads_environment(self):
+        """환경변수 값 및 타입 변환"""
+        settings = get_settings()
+        
+        assert settings.openai_api_key == "test-key"
+        assert settings.es_port == 9201
+        assert settings.openai_temperature == 0.7
+    
+    def test_cached_and_frozen(self):
+        """설정은 1회만 생성되며 변경 불가"""
+        settings = get_settings()
+        
+        assert get_settings() is settings
+        with pytest.raises(Exception):
+            settings.es_host = "other"
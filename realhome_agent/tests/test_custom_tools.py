@@ -21,6 +21,7 @@ from custom_tools import (
     loan_calculator_tool,
     get_all_tools,
     _get_dummy_policy_results,
+    _get_policy_indexer,
     ApartmentSearchInput,
     PolicySearchInput,
     LoanCalculatorInput
@@ -80,6 +81,24 @@ class TestApartmentSearchTool:
         assert len(result_dict["apartments"]) == 1
         assert result_dict["apartments"][0]["아파트명"] == "테스트아파트"
     
+    @patch('custom_tools.get_search_engine')
+    def test_search_result_cached(self, mock_get_engine):
+        """같은 조건의 재검색은 캐시 반환, 결과 없음은 캐시하지 않음"""
+        mock_engine = MagicMock()
+        mock_engine.hybrid_search.return_value = [{'kapt_name': '테스트아파트', '_score': 0.9}]
+        mock_get_engine.return_value = mock_engine
+        args = {"districts": ["송파구"], "max_price": 80000}
+        
+        first = search_apartment_tool.invoke(args)
+        second = search_apartment_tool.invoke(dict(args))
+        assert first == second
+        assert mock_engine.hybrid_search.call_count == 1
+        
+        mock_engine.hybrid_search.return_value = []
+        search_apartment_tool.invoke({"districts": ["마포구"]})
+        search_apartment_tool.invoke({"districts": ["마포구"]})
+        assert mock_engine.hybrid_search.call_count == 3
+    
     @patch('custom_tools.get_search_engine')
     def test_search_no_results(self, mock_get_engine):
         """검색 결과 없음 테스트"""
@@ -162,6 +181,45 @@ class TestPolicySearchTool:
         policy_texts = " ".join([p["title"] + p["snippet"] for p in result_dict["policies"]])
         assert "생애최초" in policy_texts
     
+    @patch('policy_indexer.PolicyIndexer')
+    def test_policy_indexer_reused(self, MockIndexer):
+        """정책 인덱서는 연결 성공 시 재사용, 실패 시 캐시하지 않음"""
+        _get_policy_indexer.cache_clear()
+        MockIndexer.return_value.connect.side_effect = [False, True]
+        
+        with pytest.raises(ConnectionError):
+            _get_policy_indexer("localhost", 9200, "realhome_policies")
+        first = _get_policy_indexer("localhost", 9200, "realhome_policies")
+        second = _get_policy_indexer("localhost", 9200, "realhome_policies")
+        
+        assert first is second
+        assert MockIndexer.call_count == 2
+        _get_policy_indexer.cache_clear()
+    
+    @patch('custom_tools._get_policy_indexer')
+    def test_policy_snippet_uses_preview(self, mock_get_indexer):
+        """하이라이트가 없으면 인덱싱 시 저장한 preview로 스니펫 생성"""
+        mock_get_indexer.return_value.search.return_value = [
+            {
+                "score": 3.0,
+                "document": {"title": "정책A", "preview": "미리보기", "full_text": "본문 전체"},
+                "highlights": {}
+            },
+            {
+                "score": 2.0,
+                "document": {"title": "정책B", "preview": "미리보기"},
+                "highlights": {"sections.content": ["<em>LTV</em> 1", "<em>LTV</em> 2", "<em>LTV</em> 3"]}
+            }
+        ]
+        
+        result_dict = json.loads(policy_search_tool.invoke({"query": "LTV"}))
+        
+        snippets = [p["snippet"] for p in result_dict["policies"]]
+        assert snippets == ["미리보기...", "<em>LTV</em> 1 ... <em>LTV</em> 2"]
+        source_includes = mock_get_indexer.return_value.search.call_args.kwargs["source_includes"]
+        assert "full_text" not in source_includes
+        assert "preview" in source_includes
+    
     @patch.dict(os.environ, {}, clear=True)
     def test_policy_search_without_api_key(self):
         """API 키 없이 정책 검색 테스트"""
@@ -308,6 +366,25 @@ class TestLoanCalculatorTool:
         monthly_payment_str = result_dict["최종_결과"]["예상월상환액"]
         assert "만원" in monthly_payment_str
     
+    def test_monthly_payment_matches_closed_form(self):
+        """월 상환액이 원리금균등상환 공식과 일치 (무이자 포함)"""
+        for rate in (4.5, 0):
+            result = loan_calculator_tool.invoke({
+                "property_price": 50000,
+                "annual_income": 20000,
+                "loan_term_years": 30,
+                "interest_rate": rate,
+                "is_regulated_area": False,
+                "is_first_home": True,
+                "house_count": 0
+            })
+            result_dict = json.loads(result)
+            
+            loan = 50000 * 0.8  # LTV 80% (DSR 한도보다 작음)
+            r, n = rate / 100 / 12, 360
+            expected = loan * r * (1 + r) ** n / ((1 + r) ** n - 1) if r else loan / n
+            assert result_dict["최종_결과"]["예상월상환액"] == f"{expected:,.0f}만원"
+    
     def test_feasibility_assessment(self):
         """구매 가능성 평가 테스트"""
         # 적정 범위 케이스
@@ -42,9 +42,9 @@ class TestLoadApartmentsData:
         result = load_apartments_data("test.csv")
         
         assert len(result) == 2
-        assert result[0]['kapt_code'] == 'A001'
-        assert result[0]['kapt_name'] == '아파트1'
-        assert result[0]['gu'] == '송파구'
+        assert result.iloc[0]['kapt_code'] == 'A001'
+        assert result.iloc[0]['kapt_name'] == '아파트1'
+        assert result.iloc[0]['gu'] == '송파구'
     
     @patch('pandas.read_csv')
     def test_empty_dataframe(self, mock_read_csv):
@@ -59,7 +59,7 @@ class TestLoadApartmentsData:
         
         result = load_apartments_data("empty.csv")
         
-        assert result == []
+        assert result.empty
 
 
 class TestLoadReviewsData:
@@ -101,6 +101,24 @@ class TestLoadReviewsData:
         apt1_row = result[result['kapt_name'] == '아파트1'].iloc[0]
         pros_count = apt1_row['pros'].count('|') + 1
         assert pros_count <= 5
+    
+    @patch('pandas.read_csv')
+    def test_skip_missing_reviews(self, mock_read_csv):
+        """장/단점은 각각 비어있는 값을 건너뛰고 집계"""
+        mock_df = pd.DataFrame({
+            'kaptName': ['아파트1', '아파트1', '아파트1', '아파트2'],
+            'Score': [4.0, 2.0, 3.0, 5.0],
+            'Pros': [None, '넓음', '밝음', None],
+            'Cons': ['비쌈', None, '좁음', None]
+        })
+        mock_read_csv.return_value = mock_df
+        
+        result = load_reviews_data("reviews.csv").set_index('kapt_name')
+        
+        assert result.loc['아파트1', 'pros'] == '넓음 | 밝음'
+        assert result.loc['아파트1', 'cons'] == '비쌈 | 좁음'
+        assert result.loc['아파트2', 'pros'] == ''
+        assert result.loc['아파트2', 'review_score'] == 5.0
 
 
 class TestLoadDealsData:
@@ -156,10 +174,10 @@ class TestMergeData:
     
     def test_merge_all_data(self):
         """전체 데이터 병합 테스트"""
-        apartments = [
+        apartments = pd.DataFrame([
             {'kapt_code': 'A001', 'kapt_name': '아파트1', 'doro_juso': '주소1', 'gu': '송파구'},
             {'kapt_code': 'A002', 'kapt_name': '아파트2', 'doro_juso': '주소2', 'gu': '노원구'}
-        ]
+        ])
         
         reviews = pd.DataFrame({
             'kapt_name': ['아파트1', '아파트2'],
@@ -192,11 +210,33 @@ class TestMergeData:
         assert apt2['review_score'] == 3.8
         assert apt2['price_manwon'] is None
     
+    def test_merge_builds_combined_review(self):
+        """병합 시 임베딩용 리뷰 텍스트 생성"""
+        apartments = pd.DataFrame([
+            {'kapt_code': 'A001', 'kapt_name': '아파트1', 'gu': '송파구'},
+            {'kapt_code': 'A002', 'kapt_name': '아파트2', 'gu': '노원구'},
+            {'kapt_code': 'A003', 'kapt_name': '아파트3', 'gu': '강동구'}
+        ])
+        
+        reviews = pd.DataFrame({
+            'kapt_name': ['아파트1', '아파트2'],
+            'review_score': [4.5, 3.8],
+            'pros': ['좋음', None],
+            'cons': ['비쌈', '오래됨']
+        })
+        deals = pd.DataFrame(columns=['kapt_name', 'gu', 'dong', 'price_manwon', 'area_m2', 'floor', 'year_built'])
+        
+        result = {r['kapt_name']: r for r in merge_data(apartments, reviews, deals)}
+        
+        assert result['아파트1']['combined_review'] == '장점: 좋음 단점: 비쌈'
+        assert result['아파트2']['combined_review'] == '단점: 오래됨'
+        assert result['아파트3']['combined_review'] == ''
+    
     def test_merge_empty_reviews(self):
         """빈 리뷰 데이터 병합"""
-        apartments = [
+        apartments = pd.DataFrame([
             {'kapt_code': 'A001', 'kapt_name': '아파트1', 'gu': '송파구'}
-        ]
+        ])
         
         reviews = pd.DataFrame(columns=['kapt_name', 'review_score', 'pros', 'cons'])
         deals = pd.DataFrame(columns=['kapt_name', 'gu', 'dong', 'price_manwon', 'area_m2', 'floor', 'year_built'])
@@ -275,7 +315,7 @@ class TestMainFunction:
     def test_main_flow(self, mock_load_apt, mock_load_review, mock_load_deals, 
                        mock_merge, mock_index):
         """메인 함수 흐름 테스트"""
-        mock_load_apt.return_value = [{'kapt_code': 'A001', 'kapt_name': '테스트'}]
+        mock_load_apt.return_value = pd.DataFrame([{'kapt_code': 'A001', 'kapt_name': '테스트'}])
         mock_load_review.return_value = pd.DataFrame()
         mock_load_deals.return_value = pd.DataFrame()
         mock_merge.return_value = [{'kapt_code': 'A001', 'kapt_name': '테스트'}]
@@ -16,7 +16,7 @@ import os
 # 상위 디렉토리 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from search_engine import SearchEngine, ESConfig, EmbeddingModel
+from search_engine import SearchEngine, ESConfig, EmbeddingModel, get_embedding_model
 from models import SearchQuery, ApartmentSchema
 
 
@@ -101,6 +101,14 @@ class TestSearchEngine:
         assert engine.config == config
         assert engine.client is None
     
+    def test_engines_share_embedding_model(self):
+        """엔진 인스턴스 간 임베딩 모델 공유 테스트"""
+        engine_a = SearchEngine(ESConfig())
+        engine_b = SearchEngine(ESConfig(index_name="other_index"))
+        
+        assert engine_a.embedding_model is engine_b.embedding_model
+        assert engine_a.embedding_model is get_embedding_model()
+    
     def test_index_mapping_structure(self):
         """인덱스 매핑 구조 테스트"""
         mapping = SearchEngine.INDEX_MAPPING
@@ -126,6 +134,21 @@ class TestSearchEngine:
         assert props["embedding"]["type"] == "dense_vector"
         assert props["embedding"]["dims"] == 1024  # BAAI/bge-m3 모델
     
+    def test_num_candidates_factor(self):
+        """kNN num_candidates 계산 테스트"""
+        engine = SearchEngine(ESConfig(knn_candidates_factor=5))
+        
+        assert engine._num_candidates(10) == 50
+        assert engine._num_candidates(5000) == 10000  # ES 상한
+    
+    def test_embedding_hnsw_options(self):
+        """벡터 필드 HNSW 인덱스 옵션 테스트"""
+        index_options = SearchEngine.INDEX_MAPPING["mappings"]["properties"]["embedding"]["index_options"]
+        
+        assert index_options["type"] == "int8_hnsw"
+        assert index_options["m"] == 32
+        assert index_options["ef_construction"] == 200
+    
     @patch('search_engine.Elasticsearch')
     def test_connect_success(self, mock_es):
         """연결 성공 테스트"""
@@ -152,6 +175,47 @@ class TestSearchEngine:
         
         assert result is False
     
+    @patch('search_engine.time.sleep')
+    @patch('search_engine.helpers.parallel_bulk')
+    def test_bulk_index_retries_rejected(self, mock_parallel_bulk, mock_sleep):
+        """429로 거절된 문서만 스레드 수를 줄여 재시도"""
+        engine = SearchEngine(ESConfig(bulk_thread_count=4))
+        engine.client = MagicMock()
+        documents = [{"kapt_code": "A1"}, {"kapt_code": "A2"}, {"kapt_code": "A3"}]
+        
+        mock_parallel_bulk.side_effect = [
+            iter([
+                (True, {"index": {"_id": "A1", "status": 201}}),
+                (False, {"index": {"_id": "A2", "status": 429}}),
+                (False, {"index": {"_id": "A3", "status": 400}}),
+            ]),
+            iter([(True, {"index": {"_id": "A2", "status": 201}})]),
+        ]
+        
+        success, fail = engine.bulk_index_documents(documents, generate_embeddings=False)
+        
+        assert (success, fail) == (2, 1)
+        retry_call = mock_parallel_bulk.call_args_list[1]
+        assert [a["_id"] for a in retry_call.args[1]] == ["A2"]
+        assert retry_call.kwargs["thread_count"] == 2
+        mock_sleep.assert_called_once()
+    
+    @patch('search_engine.Elasticsearch')
+    def test_is_connected(self, mock_es):
+        """연결 상태 확인 (재연결 없이 기존 클라이언트로 ping)"""
+        engine = SearchEngine(ESConfig())
+        assert engine.is_connected() is False
+        
+        mock_client = MagicMock()
+        mock_client.ping.return_value = True
+        mock_es.return_value = mock_client
+        engine.connect(max_retries=1, retry_delay=0)
+        
+        assert engine.is_connected() is True
+        mock_client.ping.side_effect = Exception("Connection refused")
+        assert engine.is_connected() is False
+        mock_es.assert_called_once()
+    
     def test_build_filter_conditions_empty(self):
         """빈 필터 조건 테스트"""
         engine = SearchEngine(ESConfig())
@@ -257,6 +321,25 @@ class TestSearchEngine:
         results = engine.hybrid_search(query)
         assert results == []
     
+    def test_vector_search_many_single_request(self):
+        """배치 벡터 검색: 임베딩 1회 + msearch 1회"""
+        engine = SearchEngine(ESConfig())
+        engine.client = MagicMock()
+        engine.client.msearch.return_value = {"responses": [
+            {"hits": {"hits": [{"_source": {"kapt_name": "A"}, "_score": 1.0, "_id": "1"}]}},
+            {"hits": {"hits": []}},
+        ]}
+        engine.embedding_model = MagicMock()
+        engine.embedding_model.encode.return_value = np.zeros((2, 4))
+        
+        results = engine.vector_search_many(["조용한 동네", "역세권"], top_k=3)
+        
+        engine.embedding_model.encode.assert_called_once()
+        engine.client.msearch.assert_called_once()
+        assert len(engine.client.msearch.call_args.kwargs["searches"]) == 4
+        assert results[0][0]["kapt_name"] == "A"
+        assert results[1] == []
+    
     @patch('search_engine.Elasticsearch')
     def test_get_document_not_found(self, mock_es):
         """존재하지 않는 문서 조회"""